@@ -1,7 +1,7 @@
 # DocketBot.spec — Onedir Build
 # Run with: pyinstaller DocketBot.spec
 
-from PyInstaller.utils.hooks import collect_submodules, collect_dynamic_libs, collect_data_files
+from PyInstaller.utils.hooks import collect_dynamic_libs, collect_data_files
 import os
 
 # === Paths ===
@@ -20,7 +20,10 @@ datas = [
 ] + lxml_datas
 
 binaries = lxml_binaries
-hiddenimports = collect_submodules('bs4') + collect_submodules('selenium')
+# Selenium, lxml and the PDF libraries are imported inside the functions that
+# use them; PyInstaller's analysis still finds those imports, so there is no
+# need to bundle every selenium/bs4 submodule (bs4 is no longer used at all).
+hiddenimports = []
 
 # === Build ===
 a = Analysis(
@@ -39,6 +42,8 @@ a = Analysis(
 
 pyz = PYZ(a.pure, a.zipped_data)
 
+# No UPX: compressed DLLs are unpacked on every launch, which slows startup
+
 exe = EXE(
     pyz,
     a.scripts,
@@ -48,7 +53,7 @@ exe = EXE(
     icon='assets/DocketBot.ico',
     debug=False,
     strip=False,
-    upx=True,
+    upx=False,
     console=False,
 )
 
@@ -58,6 +63,6 @@ coll = COLLECT(
     a.zipfiles,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     name='DocketBot'
 )
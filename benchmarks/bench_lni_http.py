@@ -0,0 +1,107 @@
+# benchmarks/bench_lni_http.py
+#
+# LNI contractor detail pages over HTTP against a local stub server (synthetic
+# detail pages, fixed latency per request), no browser or network needed.
+# Compares one-at-a-time fetching with the pooled keep-alive fetcher in
+# LNI.fetch_detail_html, and --check fails if the pooled pages differ or if
+# fetching a batch takes much longer than ceil(pages / workers) round trips.
+# Run from the repo root:
+#   python -m benchmarks.bench_lni_http
+#   python -m benchmarks.bench_lni_http --pages 20 --latency 0.3 --check
+
+import os
+import sys
+import io
+import math
+import time
+import argparse
+import threading
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.fixtures import make_lni_detail_page
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAVORITE_BUTTON_DIR = os.path.join(REPO_DIR, "scripts", "FavoriteButton")
+if FAVORITE_BUTTON_DIR not in sys.path:
+    sys.path.insert(0, FAVORITE_BUTTON_DIR)
+
+DEFAULT_PAGES = 20
+DEFAULT_LATENCY = 0.2
+# Pooled time may be at most this many times the ideal ceil(pages / workers) round trips
+ROUND_TRIP_TOLERANCE = 2.0
+
+# === Stub server ===
+def start_stub(latency):
+    class DetailHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            seed = int(self.path.rsplit("=", 1)[-1])
+            body = make_lni_detail_page(seed=seed).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DetailHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# === Measurement ===
+def timed_fetch(urls, workers):
+    from LNI import fetch_detail_html
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        pages = fetch_detail_html(urls, workers=workers)
+        return time.perf_counter() - start, pages
+
+def run(n_pages, latency, workers):
+    from navigation import configure_rate
+    server = start_stub(latency)
+    host, port = server.server_address
+    configure_rate(host, 1000, 1000)  # the stub doesn't need protecting
+    urls = [f"http://{host}:{port}/verify/Detail.aspx?LicenseNumber={i}" for i in range(n_pages)]
+    try:
+        sequential, expected = timed_fetch(urls, 1)
+        pooled, pages = timed_fetch(urls, workers)
+    finally:
+        server.shutdown()
+
+    ideal = math.ceil(n_pages / workers) * latency
+    print(f"{n_pages} detail pages, {latency * 1000:.0f} ms per request")
+    print(f"  one at a time:      {sequential:6.2f} s")
+    print(f"  pooled ({workers} workers): {pooled:6.2f} s  (ideal {ideal:.2f} s)")
+
+    failures = []
+    if pages != expected or any(page is None for page in pages):
+        failures.append("pooled fetch returned different or missing pages")
+    if pooled > ROUND_TRIP_TOLERANCE * ideal:
+        failures.append(f"pooled fetch took {pooled:.2f} s, over {ROUND_TRIP_TOLERANCE}x the ideal {ideal:.2f} s")
+    return failures
+
+def main(argv=None):
+    from LNI import LNI_HTTP_WORKERS
+    parser = argparse.ArgumentParser(description="Benchmark the LNI detail page HTTP fetcher against a local stub.")
+    parser.add_argument("--pages", type=int, default=DEFAULT_PAGES, help="detail pages (registrations) to fetch")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="stub response time in seconds")
+    parser.add_argument("--workers", type=int, default=LNI_HTTP_WORKERS)
+    parser.add_argument("--check", action="store_true", help="fail if pages differ or the pooled fetch is slow")
+    args = parser.parse_args(argv)
+
+    failures = run(args.pages, args.latency, args.workers)
+    if args.check:
+        if failures:
+            print("\n❌ LNI HTTP fetch check failed:")
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print("\n✅ Pooled fetch returns the same pages in about ceil(pages / workers) round trips")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
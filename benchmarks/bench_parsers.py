@@ -0,0 +1,209 @@
+# benchmarks/bench_parsers.py
+#
+# Offline parser benchmarks against synthetic pages, no browser or CAPTCHA needed.
+# Run from the repo root:
+#   python -m benchmarks.bench_parsers
+#   python -m benchmarks.bench_parsers --sizes 100 1000 50000 --json bench.json
+#   python -m benchmarks.bench_parsers --baseline bench.json   (fails on >25% slowdown)
+#   python -m benchmarks.bench_parsers --check   (fails if calendar_parser disagrees with the bs4 reference)
+
+import os
+import sys
+import io
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+
+from benchmarks.fixtures import make_calendar_page, make_lni_list_page, make_lni_detail_page
+
+# The FavoriteButton scripts import their siblings script-style (`from extractors import ...`)
+FAVORITE_BUTTON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "FavoriteButton")
+if FAVORITE_BUTTON_DIR not in sys.path:
+    sys.path.insert(0, FAVORITE_BUTTON_DIR)
+
+CALENDAR_RESULT_CLASS = "dw-search-result std-vertical-med-margin dw-cal-search-result"
+DEFAULT_CALENDAR_SIZES = [100, 1000, 10000, 50000]
+DEFAULT_LAWSUIT_SIZES = [10, 100, 1000]
+REGRESSION_TOLERANCE = 1.25
+EQUIVALENCE_SIZE = 200
+
+# === Parser Entry Points ===
+# Each returns the number of records produced so throughput can be reported.
+# The BeautifulSoup tree walk scrape_cases/create_waivers used before calendar_parser,
+# kept here as the reference the streaming parser is measured against.
+def bs4_reference_cases(html):
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "lxml")
+    cases = []
+    for result in soup.find_all("div", class_=CALENDAR_RESULT_CLASS):
+        case = {}
+        name_div = result.find('div', class_="dw-icon-row")
+        if name_div:
+            case["Client Name"] = name_div.find_all("div")[-1].text.strip()
+        for item in result.find_all("div", class_="dw-cal-result-item"):
+            label = item.find("div", class_="dw-cal-result-label").text.strip(": ")
+            case[label] = item.find("div", class_="dw-cal-result-data").text.strip()
+        cases.append(case)
+    return cases
+
+def bs4_reference_parse(html):
+    return len(bs4_reference_cases(html))
+
+def calendar_parser_all(html):
+    from scripts.calendar_parser import iter_calendar_cases
+    return sum(1 for _ in iter_calendar_cases(html))
+
+def calendar_parser_sunnyside(html):
+    from scripts.calendar_parser import iter_calendar_cases, SUNNYSIDE_COURT
+    stats = {}
+    for _ in iter_calendar_cases(html, court=SUNNYSIDE_COURT, stats=stats):
+        pass
+    return stats["seen"]
+
+def lni_contractor_parse(html):
+    from LNI import parse_lni_contractor_html
+    result = parse_lni_contractor_html(html)
+    return 1 + len(result.get("Lawsuits") or [])
+
+def favorite_button_lni_parse(html):
+    from FavoriteButton import get_lni_info_from_html
+    contractors = get_lni_info_from_html(LNI_LIST_HTML, [html])
+    return sum(1 + len(c.get("Bonds", [])) + len(c.get("Lawsuits", [])) for c in contractors)
+
+def zipped_lni_parse(html):
+    from scripts.FavoriteButton.zipped_version.lni_parser import get_lni_info_from_html
+    contractors = get_lni_info_from_html(LNI_LIST_HTML, [html])
+    return sum(1 + len(c.get("Bonds", [])) + len(c.get("Lawsuits", [])) for c in contractors)
+
+LNI_LIST_HTML = make_lni_list_page(5)
+
+PARSERS = {
+    "bs4 reference (old parseCase)": ("calendar", bs4_reference_parse),
+    "calendar_parser.iter_calendar_cases": ("calendar", calendar_parser_all),
+    "calendar_parser (Sunnyside only)": ("calendar", calendar_parser_sunnyside),
+    "LNI.parse_lni_contractor_html": ("lni", lni_contractor_parse),
+    "FavoriteButton.get_lni_info_from_html": ("lni", favorite_button_lni_parse),
+    "zipped_version.get_lni_info_from_html": ("lni", zipped_lni_parse),
+}
+
+# === Measurement ===
+def measure(fn, html, repeat):
+    # Timing and memory are measured in separate passes; tracemalloc slows parsing down
+    best = float("inf")
+    records = 0
+    with redirect_stdout(io.StringIO()):
+        fn(html)  # warm-up: module imports and selector caches
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            records = fn(html)
+            best = min(best, time.perf_counter() - start)
+
+        gc.collect()
+        tracemalloc.start()
+        fn(html)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "seconds": best,
+        "peak_mb": peak / (1024 * 1024),
+        "records": records,
+        "records_per_sec": records / best if best else 0.0,
+        "page_kb": len(html) / 1024,
+    }
+
+def run(calendar_sizes, lawsuit_sizes, only=None, repeat=3):
+    results = {}
+    for name, (kind, fn) in PARSERS.items():
+        if only and not any(o in name for o in only):
+            continue
+        sizes = calendar_sizes if kind == "calendar" else lawsuit_sizes
+        for size in sizes:
+            if kind == "calendar":
+                html = make_calendar_page(size)
+            else:
+                html = make_lni_detail_page(n_bonds=max(1, size // 10), n_lawsuits=size)
+            key = f"{name}[{size}]"
+            results[key] = measure(fn, html, repeat)
+            r = results[key]
+            print(f"{key:<48} {r['seconds'] * 1000:>10.1f} ms {r['peak_mb']:>9.1f} MB "
+                  f"{r['records_per_sec']:>12,.0f} rec/s  ({r['page_kb']:,.0f} KB page)")
+    return results
+
+# === Equivalence ===
+def check_equivalence(size=EQUIVALENCE_SIZE):
+    """Differences between calendar_parser and the bs4 reference on one synthetic page."""
+    from scripts.calendar_parser import parse_calendar, SUNNYSIDE_COURT
+    html = make_calendar_page(size)
+    reference = bs4_reference_cases(html)
+    for case in reference:
+        # calendar_parser keeps only the case number itself
+        case["Case Number"] = case["Case Number"].split(' ')[0]
+    parsed = [{key: case[key] for key in ref} for case, ref in zip(parse_calendar(html), reference)]
+    problems = []
+    if len(parsed) != len(reference):
+        problems.append(f"{len(parsed)} results parsed, reference has {len(reference)}")
+    problems += [f"result #{i + 1}: {p} != {r}" for i, (p, r) in enumerate(zip(parsed, reference)) if p != r][:5]
+    sunnyside = [case for case in reference if case["Court"] == SUNNYSIDE_COURT]
+    if len(parse_calendar(html, court=SUNNYSIDE_COURT)) != len(sunnyside):
+        problems.append("Sunnyside filter kept a different number of results than the reference")
+    return problems
+
+def compare(results, baseline_path, tolerance=REGRESSION_TOLERANCE):
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    regressions = []
+    for key, r in results.items():
+        base = baseline.get(key)
+        if base and r["seconds"] > base["seconds"] * tolerance:
+            regressions.append(f"{key}: {base['seconds'] * 1000:.1f} ms -> {r['seconds'] * 1000:.1f} ms")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DocketBot HTML parsers on synthetic pages.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_CALENDAR_SIZES,
+                        help="number of dw-cal-search-result blocks per calendar page")
+    parser.add_argument("--lawsuits", type=int, nargs="+", default=DEFAULT_LAWSUIT_SIZES,
+                        help="number of lawsuits per LNI detail page (bonds = lawsuits / 10)")
+    parser.add_argument("--only", nargs="+", help="only run parsers whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against a previous --json file")
+    parser.add_argument("--check", action="store_true",
+                        help="only check calendar_parser returns the same cases as the bs4 reference")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check_equivalence()
+        if problems:
+            print("❌ calendar_parser disagrees with the bs4 reference:")
+            for line in problems:
+                print(f"  {line}")
+            return 1
+        print(f"✅ calendar_parser matches the bs4 reference on {EQUIVALENCE_SIZE} results")
+        return 0
+
+    print(f"{'parser[size]':<48} {'time':>13} {'peak':>12} {'throughput':>18}")
+    results = run(args.sizes, args.lawsuits, args.only, args.repeat)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if args.baseline:
+        regressions = compare(results, args.baseline)
+        if regressions:
+            print("\n❌ Regressions vs baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\n✅ No regressions vs baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
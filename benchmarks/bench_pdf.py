@@ -0,0 +1,141 @@
+# benchmarks/bench_pdf.py
+#
+# Offline PDF generation benchmarks: the FavoriteButton New Matter Form with
+# many LNI contractors, and waiver batches. Reports time and output size per
+# batch size. --check fails if growth is worse than linear:
+#   - output bytes (deterministic): the bytes added per item between the two
+#     largest batches may be at most BYTES_TOLERANCE times those between the
+#     two smallest;
+#   - render time: a least-squares line through all but the largest batch
+#     predicts the largest one, which may take at most TIME_TOLERANCE times
+#     that. A fit over several sizes isn't thrown off by one noisy
+#     measurement the way a ratio of two steps is.
+# Run from the repo root:
+#   python -m benchmarks.bench_pdf
+#   python -m benchmarks.bench_pdf --contractors 10 50 100 400 --check
+
+import os
+import sys
+import io
+import gc
+import time
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+
+from benchmarks.fixtures import make_lni_contractors, make_waiver_clients
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAVORITE_BUTTON_DIR = os.path.join(REPO_DIR, "scripts", "FavoriteButton")
+if FAVORITE_BUTTON_DIR not in sys.path:
+    sys.path.insert(0, FAVORITE_BUTTON_DIR)
+
+NEW_MATTER_TEMPLATE = os.path.join(REPO_DIR, "assets", "0000 New Matter Form.pdf")
+WAIVER_TEMPLATE = os.path.join(REPO_DIR, "assets", "waiver_template.pdf")
+DEFAULT_CONTRACTORS = [10, 25, 50, 100, 200]
+DEFAULT_CLIENTS = [25, 50, 100, 200, 400]
+MIN_CHECK_SIZES = 4
+BYTES_TOLERANCE = 1.25
+TIME_TOLERANCE = 1.5
+
+# === Generators ===
+def fill_pdf(n, out_path):
+    from FavoriteButton import fill_pdf
+    sos = {"company_name": "BENCH CONSTRUCTION LLC", "ubi": "600000000"}
+    fill_pdf(sos, make_lni_contractors(n), {"status": "Not implemented"}, out_path,
+             template_path=NEW_MATTER_TEMPLATE)
+
+def waivers(n, out_path):
+    from scripts.waiver_renderer import render_waivers
+    render_waivers(make_waiver_clients(n), WAIVER_TEMPLATE, "25", out_path, bar_number="00000", workers=1)
+
+GENERATORS = {
+    "FavoriteButton.fill_pdf": ("contractors", fill_pdf),
+    "waiver_renderer.render_waivers": ("clients", waivers),
+}
+
+# === Measurement ===
+def measure(fn, n, repeat):
+    with tempfile.TemporaryDirectory() as tmp, redirect_stdout(io.StringIO()):
+        out_path = os.path.join(tmp, "out.pdf")
+        fn(1, out_path)  # warm-up: imports and font metrics
+        best = float("inf")
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            fn(n, out_path)
+            best = min(best, time.perf_counter() - start)
+        size = os.path.getsize(out_path)
+    return {"seconds": best, "bytes": size}
+
+def bytes_growth(points):
+    """Bytes added per item between the two largest batches over those between the two smallest."""
+    def per_item(a, b):
+        (na, ra), (nb, rb) = a, b
+        return (rb["bytes"] - ra["bytes"]) / (nb - na)
+    first, last = per_item(*points[:2]), per_item(*points[-2:])
+    return last / first if first > 0 else float("inf")
+
+def linear_fit(points):
+    """(intercept, slope) of the least-squares line of seconds against n."""
+    xs = [n for n, _ in points]
+    ys = [r["seconds"] for _, r in points]
+    x_mean, y_mean = sum(xs) / len(xs), sum(ys) / len(ys)
+    slope = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys)) / sum((x - x_mean) ** 2 for x in xs)
+    return y_mean - slope * x_mean, slope
+
+def time_growth(points):
+    """Largest batch's time over what a line through the smaller batches predicts."""
+    intercept, slope = linear_fit(points[:-1])
+    n, r = points[-1]
+    predicted = intercept + slope * n
+    return r["seconds"] / predicted if predicted > 0 else float("inf")
+
+def run(contractors, clients, only=None, repeat=3):
+    failures = []
+    for name, (unit, fn) in GENERATORS.items():
+        if only and not any(o in name for o in only):
+            continue
+        sizes = contractors if unit == "contractors" else clients
+        points = []
+        for n in sorted(sizes):
+            r = measure(fn, n, repeat)
+            points.append((n, r))
+            print(f"{name}[{n} {unit}]".ljust(52) +
+                  f"{r['seconds'] * 1000:>10.1f} ms {r['bytes'] / 1024:>10.0f} KB "
+                  f"{r['bytes'] / n / 1024:>8.1f} KB/{unit[:-1]}")
+        if len(points) < MIN_CHECK_SIZES:
+            failures.append(f"{name}: need at least {MIN_CHECK_SIZES} {unit} sizes to check growth")
+            continue
+        byte_ratio, time_ratio = bytes_growth(points), time_growth(points)
+        print(f"  bytes per added {unit[:-1]}: {byte_ratio:.2f}x the smallest step; "
+              f"largest batch time: {time_ratio:.2f}x the linear fit")
+        if byte_ratio > BYTES_TOLERANCE:
+            failures.append(f"{name}: bytes per added {unit[:-1]} grew {byte_ratio:.2f}x (limit {BYTES_TOLERANCE}x)")
+        if time_ratio > TIME_TOLERANCE:
+            failures.append(f"{name}: largest batch took {time_ratio:.2f}x the linear fit (limit {TIME_TOLERANCE}x)")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DocketBot PDF generation on synthetic data.")
+    parser.add_argument("--contractors", type=int, nargs="+", default=DEFAULT_CONTRACTORS,
+                        help="LNI contractors per New Matter Form")
+    parser.add_argument("--clients", type=int, nargs="+", default=DEFAULT_CLIENTS,
+                        help="clients per waiver batch")
+    parser.add_argument("--only", nargs="+", help="only run generators whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="fail if cost per item grows with batch size")
+    args = parser.parse_args(argv)
+
+    failures = run(args.contractors, args.clients, args.only, args.repeat)
+    if args.check:
+        if failures:
+            print("\n❌ Non-linear growth:")
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print("\n✅ Output size and render time grow linearly")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
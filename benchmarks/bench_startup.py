@@ -0,0 +1,103 @@
+# benchmarks/bench_startup.py
+#
+# Import-time report for the GUI and each feature entry point, from
+# `python -X importtime` in a fresh interpreter. Heavy dependencies (selenium,
+# lxml, the PDF libraries) should only load when a feature first needs them,
+# so main.py gets to an interactive window quickly. --check fails if main.py's
+# imports exceed STARTUP_BUDGET_MS or any entry point loads a deferred module.
+# Run from the repo root:
+#   python -m benchmarks.bench_startup
+#   python -m benchmarks.bench_startup --top 15 --check
+
+import os
+import re
+import sys
+import argparse
+import tempfile
+import subprocess
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = {
+    "GUI (main.py)": "main",
+    "Start Scraper": "scripts.scrape_cases",
+    "Scrape All Profiles": "scripts.batch_scrape",
+    "Crawl Date Range": "scripts.calendar_crawl",
+    "Run Waiver Generator": "scripts.create_waivers",
+}
+# Top-level packages that must not be imported just by loading an entry point
+DEFERRED = ("selenium", "bs4", "lxml", "PyPDF2", "pypdf", "reportlab", "requests")
+STARTUP_BUDGET_MS = 150
+GUI_ENTRY = "GUI (main.py)"
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+def import_times(module, env):
+    """{name: (self_us, cumulative_us, depth)} for every module imported by `import module`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+    times = {}
+    started = False
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        if not indent and name in ("site", "encodings"):
+            # Interpreter start-up, before `import module` runs
+            times.clear()
+            started = True
+            continue
+        if started:
+            times[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return times
+
+def scratch_env(tmp):
+    # Keep anything that touches %LOCALAPPDATA% away from the real config
+    env = dict(os.environ, LOCALAPPDATA=tmp)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+def run(top, repeat):
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        env = scratch_env(tmp)
+        for label, module in ENTRY_POINTS.items():
+            import_times(module, env)  # warm-up: write .pyc files
+            runs = [import_times(module, env) for _ in range(repeat)]
+            times = min(runs, key=lambda t: t.get(module, (0, 0, 0))[1])
+            total_ms = times.get(module, (0, 0, 0))[1] / 1000
+            print(f"\n{label} (import {module}): {total_ms:.1f} ms")
+            heaviest = sorted(((c, s, n) for n, (s, c, d) in times.items() if n != module), reverse=True)[:top]
+            for cumulative_us, self_us, name in heaviest:
+                print(f"  {name:<40} {cumulative_us / 1000:>8.1f} ms  (self {self_us / 1000:.1f} ms)")
+
+            loaded = sorted({name.split(".")[0] for name in times} & set(DEFERRED))
+            if loaded:
+                failures.append(f"{label}: imports {', '.join(loaded)} at load")
+            if label == GUI_ENTRY and total_ms > STARTUP_BUDGET_MS:
+                failures.append(f"{label}: {total_ms:.0f} ms of imports (budget {STARTUP_BUDGET_MS} ms)")
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report DocketBot import times and enforce the startup budget.")
+    parser.add_argument("--top", type=int, default=8, help="heaviest imports to list per entry point")
+    parser.add_argument("--repeat", type=int, default=3, help="best of this many fresh interpreters")
+    parser.add_argument("--check", action="store_true",
+                        help=f"fail over {STARTUP_BUDGET_MS} ms or if a deferred dependency loads at import")
+    args = parser.parse_args(argv)
+
+    failures = run(args.top, args.repeat)
+    if args.check:
+        if failures:
+            print("\n❌ Startup budget exceeded:")
+            for line in failures:
+                print(f"  {line}")
+            return 1
+        print(f"\n✅ Startup within {STARTUP_BUDGET_MS} ms; heavy dependencies load on first use")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# benchmarks/fixtures.py
+
+import random
+
+COURTS = [
+    "SUNNYSIDE MUNICIPAL",
+    "YAKIMA COUNTY DISTRICT",
+    "GRANDVIEW MUNICIPAL",
+    "TOPPENISH MUNICIPAL",
+]
+HEARINGS = ["ARRAIGNMENT", "PRETRIAL HEARING", "REVIEW HEARING", "JURY TRIAL", "SENTENCING"]
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+FIRST_NAMES = ["JOHN", "MARIA", "JOSE", "SARAH", "DAVID", "ANA", "MICHAEL", "LUIS", "EMILY", "CARLOS"]
+LAST_NAMES = ["GARCIA", "SMITH", "MARTINEZ", "JOHNSON", "LOPEZ", "BROWN", "HERNANDEZ", "DAVIS", "GONZALEZ", "MILLER"]
+COUNTIES = ["YAKIMA", "KING", "SPOKANE", "BENTON", "FRANKLIN", "OKANOGAN"]
+BOND_COMPANIES = ["WESTERN SURETY CO", "OHIO CASUALTY INS CO", "MERCHANTS BONDING CO", "TRAVELERS CASUALTY"]
+
+# === Calendar Pages (dw.courts.wa.gov attorney calendar) ===
+def calendar_result_html(rng, idx):
+    name = f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)} {chr(65 + idx % 26)}"
+    court = rng.choice(COURTS)
+    case_num = f"C{idx:08d} SSM"
+    # Some results carry a second icon row after the client's (e.g. the citing officer)
+    officer_row = (f'\n    <div class="dw-icon-row"><div class="dw-icon"><span class="fa fa-shield"></span></div>'
+                   f'<div>Officer {rng.choice(LAST_NAMES).title()}</div></div>') if idx % 4 == 1 else ""
+    return f"""
+<div class="dw-search-result std-vertical-med-margin dw-cal-search-result">
+  <div class="dw-cal-result-date">
+    <div class="dw-cal-result-month">{rng.choice(MONTHS)}</div>
+    <div class="dw-cal-result-day">{rng.randint(1, 28)}</div>
+    <div class="dw-cal-result-year">2025</div>
+  </div>
+  <div class="dw-cal-result-body">
+    <div class="dw-icon-row"><div class="dw-icon"><span class="fa fa-user"></span></div><div>{name}</div></div>{officer_row}
+    <div class="dw-cal-result-item"><div class="dw-cal-result-label">Court:</div><div class="dw-cal-result-data">{court}</div></div>
+    <div class="dw-cal-result-item"><div class="dw-cal-result-label">Case Number:</div><div class="dw-cal-result-data">{case_num}</div></div>
+    <div class="dw-cal-result-item"><div class="dw-cal-result-label">Hearing Type:</div><div class="dw-cal-result-data">{rng.choice(HEARINGS)}</div></div>
+    <div class="dw-cal-result-item"><div class="dw-cal-result-label">Time:</div><div class="dw-cal-result-data">{rng.randint(8, 16)}:{rng.choice(["00", "15", "30", "45"])}</div></div>
+    <div class="dw-cal-result-item"><div class="dw-cal-result-label">Courtroom:</div><div class="dw-cal-result-data">{rng.randint(1, 4)}</div></div>
+  </div>
+</div>"""
+
+def make_calendar_page(n_results, seed=0):
+    rng = random.Random(seed)
+    body = "".join(calendar_result_html(rng, i) for i in range(n_results))
+    return f"""<!DOCTYPE html>
+<html><head><title>Washington Courts - Attorney Calendar</title>
+<script>var dw = {{}};</script>
+<link rel="stylesheet" href="/css/dw.css"></head>
+<body>
+<div id="header"><a href="/">Washington Courts</a></div>
+<div id="dw-content" class="dw-cal-results">
+<h2>Calendar for attorney</h2>{body}
+</div>
+<div id="footer">&copy; Administrative Office of the Courts</div>
+</body></html>"""
+
+# === LNI Pages (secure.lni.wa.gov/verify) ===
+def make_lni_list_page(n_results, seed=0):
+    rng = random.Random(seed)
+    items = "".join(
+        f'<div class="resultItem" id="LicenseNumber=CONTR{i:06d}&amp;UBI=60{rng.randint(1000000, 9999999)}">'
+        f'<div class="resultName">{rng.choice(LAST_NAMES)} CONSTRUCTION LLC</div></div>'
+        for i in range(n_results)
+    )
+    return f"<html><body><div id=\"resultsContainer\">{items}</div></body></html>"
+
+def make_lni_detail_page(n_bonds=3, n_lawsuits=20, seed=0):
+    rng = random.Random(seed)
+    business = f"{rng.choice(LAST_NAMES)} CONSTRUCTION LLC"
+
+    bond_rows = "".join(
+        f"<tr><td>{rng.choice(BOND_COMPANIES)}</td><td>BND{i:07d}</td><td>${rng.randint(6, 30) * 1000:,}.00</td></tr>"
+        for i in range(n_bonds)
+    )
+    lawsuit_rows = []
+    lawsuit_divs = []
+    for i in range(n_lawsuits):
+        case_num = f"{rng.randint(18, 25)}-2-{i:05d}-{rng.randint(1, 9)}"
+        county = rng.choice(COUNTIES)
+        parties = f"{rng.choice(LAST_NAMES)} V {business}"
+        status = rng.choice(["OPEN", "CLOSED", "DISMISSED"])
+        lawsuit_rows.append(f"<tr><td>{case_num}</td><td>{county}</td><td>{parties}</td><td>{status}</td></tr>")
+        lawsuit_divs.append(
+            f'<div class="bondRow"><span>{case_num}</span> <span>{county}</span> '
+            f'<span>{parties}</span> <span>{status}</span></div>'
+        )
+
+    return f"""<!DOCTYPE html>
+<html><head><title>Verify a Contractor</title></head>
+<body>
+<div id="layoutContainer">
+  <div class="hdrText">{business}</div>
+  <span id="BusinessName">{business}</span>
+  <span id="UBINumber">60{rng.randint(1000000, 9999999)}</span>
+  <span id="RegistrationNumber">CONTR{rng.randint(100000, 999999)}</span>
+  <span id="BondingCompany">{rng.choice(BOND_COMPANIES)}</span>
+  <span id="BondAmount">$12,000.00</span>
+  <span id="BondNumber">BND0000000</span>
+  <span id="InsuranceCompany">STATE FARM FIRE &amp; CASUALTY</span>
+  <span id="InsuranceAmount">$1,000,000.00</span>
+  <span id="Status">ACTIVE</span>
+  <span id="Suspended">NO</span>
+  <table class="detailTable">
+    <tr><td>Registration #:</td><td>CONTR{rng.randint(100000, 999999)}</td></tr>
+    <tr><td>License Suspended:</td><td>No</td></tr>
+    <tr><td>Insurance Company:</td><td>STATE FARM FIRE &amp; CASUALTY</td></tr>
+    <tr><td>Insurance Amount:</td><td>$1,000,000.00</td></tr>
+  </table>
+  <h4>Bond Information</h4>
+  <table class="bondTable">
+    <tr><th>Company</th><th>Bond #</th><th>Amount</th></tr>{bond_rows}
+  </table>
+  <h4>Lawsuits Against the Bond</h4>
+  <table class="lawsuitTable">
+    <tr><th>Case #</th><th>County</th><th>Parties</th><th>Status</th></tr>{"".join(lawsuit_rows)}
+  </table>
+  <div id="lawsuitsContainer">{"".join(lawsuit_divs)}</div>
+</div>
+</body></html>"""
+
+# === Parsed records (inputs to the PDF generators) ===
+def make_lni_contractors(n_contractors, n_lawsuits=3, seed=0):
+    """Contractor dicts shaped like FavoriteButton.get_lni_info_from_html output."""
+    rng = random.Random(seed)
+    contractors = []
+    for i in range(n_contractors):
+        business = f"{rng.choice(LAST_NAMES)} CONSTRUCTION LLC"
+        contractors.append({
+            "Registration Number": f"CONTR{i:06d}",
+            "Bonds": [{
+                "Bonding Company": rng.choice(BOND_COMPANIES),
+                "Bond Number": f"BND{i:07d}",
+                "Amount": f"${rng.randint(6, 30) * 1000:,}.00",
+            }],
+            "Insurance Company": "STATE FARM FIRE & CASUALTY",
+            "Insurance Amount": "$1,000,000.00",
+            "License Suspended": "No",
+            "Lawsuits": [{
+                "Case Number": f"{rng.randint(18, 25)}-2-{j:05d}-{rng.randint(1, 9)}",
+                "County": rng.choice(COUNTIES),
+                "Parties": f"{rng.choice(LAST_NAMES)} V {business}",
+                "Status": rng.choice(["OPEN", "CLOSED", "DISMISSED"]),
+            } for j in range(n_lawsuits)],
+        })
+    return contractors
+
+def make_waiver_clients(n_clients, seed=0):
+    """(name, "case, case") pairs shaped like create_waivers' grouped clients."""
+    rng = random.Random(seed)
+    return [
+        (f"{rng.choice(LAST_NAMES)}, {rng.choice(FIRST_NAMES)} {chr(65 + i % 26)}",
+         ", ".join(f"C{i:06d}{j} SSM" for j in range(1 + i % 5)))
+        for i in range(n_clients)
+    ]
@@ -3,11 +3,17 @@
 import subprocess
 import os
 import sys
-import json
+import queue
+import logging
 import threading
+from logging.handlers import RotatingFileHandler
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog, simpledialog
 
+from scripts.browser_pool import get_pool, shutdown_pool, idle_timeout_from_config, IDLE_CONFIG_KEY, PREWARM_CONFIG_KEY
+from scripts.config_store import get_store, config_path
+from scripts.navigation import configure_from, RATE_CONFIG_KEY
+
 APP_NAME = "DocketBot"
 DEFAULT_BAR = "00000"
 
@@ -15,37 +21,21 @@ CONFIG_KEYS = {
     "scraper.bar_number": DEFAULT_BAR,
     "scraper.destination_folder": os.path.join(os.path.expanduser("~"), "Desktop", f"{DEFAULT_BAR} Misdemeanor Clients"),
     "waiver.waiver_output_dir": os.path.join(os.path.expanduser("~"), "Desktop", f"{DEFAULT_BAR} Misdemeanor Waivers"),
-    "waiver.signature_image_path": os.path.join(os.path.expanduser("~"), "Desktop", "signature.png")
+    "waiver.signature_image_path": os.path.join(os.path.expanduser("~"), "Desktop", "signature.png"),
+    "cache.calendar_ttl_minutes": 30,
+    "waiver.per_client_pdfs": False,
+    "waiver.render_workers": 0,
+    "waiver.clients_per_volume": 0,
+    "browser.prewarm": "tab",
+    "browser.idle_shutdown_minutes": 15,
+    "scraper.calendar_window_url": "",
+    "scraper.calendar_next_selector": ""
 }
 
-def config_path():
-    return os.path.join(os.environ["LOCALAPPDATA"], APP_NAME, "config.json")
-
 def ensure_config():
-    path = config_path()
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    if os.path.exists(path):
-        with open(path, "r") as f:
-            data = json.load(f)
-    else:
-        data = {}
-    updated = False
-    for key, default in CONFIG_KEYS.items():
-        if key not in data:
-            data[key] = default
-            updated = True
-    if updated:
-        with open(path, "w") as f:
-            json.dump(data, f, indent=2)
-    return data
-
-def save_config(config):
-    with open(config_path(), "w") as f:
-        json.dump(config, f, indent=2)
-
-def load_config():
-    with open(config_path(), "r") as f:
-        return json.load(f)
+    store = get_store()
+    store.ensure_defaults(CONFIG_KEYS)
+    return store
 
 def reset_config():
     bar = CONFIG_KEYS["scraper.bar_number"]
@@ -53,24 +43,86 @@ def reset_config():
         "scraper.bar_number": bar,
         "scraper.destination_folder": os.path.join(os.path.expanduser("~"), "Desktop", f"{bar} Misdemeanor Clients"),
         "waiver.waiver_output_dir": os.path.join(os.path.expanduser("~"), "Desktop", f"{bar} Misdemeanor Waivers"),
-        "waiver.signature_image_path": CONFIG_KEYS["waiver.signature_image_path"]
+        "waiver.signature_image_path": CONFIG_KEYS["waiver.signature_image_path"],
+        "cache.calendar_ttl_minutes": CONFIG_KEYS["cache.calendar_ttl_minutes"],
+        "waiver.per_client_pdfs": CONFIG_KEYS["waiver.per_client_pdfs"],
+        "waiver.render_workers": CONFIG_KEYS["waiver.render_workers"],
+        "waiver.clients_per_volume": CONFIG_KEYS["waiver.clients_per_volume"],
+        "browser.prewarm": CONFIG_KEYS["browser.prewarm"],
+        "browser.idle_shutdown_minutes": CONFIG_KEYS["browser.idle_shutdown_minutes"],
+        "scraper.calendar_window_url": CONFIG_KEYS["scraper.calendar_window_url"],
+        "scraper.calendar_next_selector": CONFIG_KEYS["scraper.calendar_next_selector"]
     }
-    save_config(updated_config)
-    return updated_config
-
-class StdoutRedirector:
-    def __init__(self, text_widget):
-        self.text_widget = text_widget
+    get_store().replace(updated_config)
+
+# === GUI log ===
+# print() from scraper threads only puts text on a queue; the Tk thread drains
+# it every LOG_DRAIN_MS in one insert, keeps the last LOG_MAX_LINES lines in the
+# window and mirrors complete lines to a rotating log file.
+LOG_DRAIN_MS = 100
+LOG_MAX_CHUNKS_PER_DRAIN = 2000
+LOG_MAX_LINES = 5000
+LOG_FILE_BYTES = 2_000_000
+LOG_FILE_BACKUPS = 3
+
+def log_path():
+    return os.path.join(os.path.dirname(config_path()), "logs", "docketbot.log")
+
+class QueueLogSink:
+    """File-like stdout/stderr replacement that any thread can write to."""
+
+    def __init__(self, path=None):
+        self.queue = queue.SimpleQueue()
+        self.file_log = None
+        self._partial = ""
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=LOG_FILE_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.file_log = logging.getLogger(APP_NAME)
+            self.file_log.setLevel(logging.INFO)
+            self.file_log.propagate = False
+            self.file_log.addHandler(handler)
 
     def write(self, s):
-        self.text_widget.configure(state='normal')
-        self.text_widget.insert(tk.END, s)
-        self.text_widget.see(tk.END)
-        self.text_widget.configure(state='disabled')
+        if s:
+            self.queue.put(s)
+        return len(s)
 
     def flush(self):
         pass
 
+    def drain(self, max_chunks=LOG_MAX_CHUNKS_PER_DRAIN):
+        """Everything written since the last drain (up to max_chunks writes), as one string."""
+        chunks = []
+        try:
+            while len(chunks) < max_chunks:
+                chunks.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        text = "".join(chunks)
+        if text and self.file_log:
+            *lines, self._partial = (self._partial + text).split("\n")
+            for line in lines:
+                self.file_log.info(line)
+        return text
+
+def attach_log_view(root, text_widget, sink):
+    """Poll sink from the Tk thread and append its output to text_widget."""
+    def poll():
+        text = sink.drain()
+        if text:
+            text_widget.configure(state='normal')
+            text_widget.insert(tk.END, text)
+            line_count = int(text_widget.index('end-1c').split('.')[0])
+            if line_count > LOG_MAX_LINES:
+                text_widget.delete('1.0', f'{line_count - LOG_MAX_LINES + 1}.0')
+            text_widget.see(tk.END)
+            text_widget.configure(state='disabled')
+        # Come back sooner while a burst is still queued
+        root.after(1 if not sink.queue.empty() else LOG_DRAIN_MS, poll)
+    root.after(LOG_DRAIN_MS, poll)
+
 def open_folder(path):
     path = os.path.realpath(path)
     if os.path.exists(path) and os.path.isdir(path):
@@ -85,16 +137,13 @@ def run_gui():
     config = ensure_config()
 
     def reload_config():
-        nonlocal config
-        config = load_config()
-        update_settings_tab()
+        # Picks up hand edits to config.json; changes made in the GUI apply immediately
+        config.reload()
 
     def perform_reset():
         result = messagebox.askyesno("Reset Config", "Are you sure you want to reset all settings to defaults?")
         if result:
-            nonlocal config
-            config = reset_config()
-            update_settings_tab()
+            reset_config()
 
     root = tk.Tk()
     root.title("DocketBot")
@@ -130,28 +179,82 @@ def run_gui():
 
     update_settings_tab()
 
+    def show_recent_runs():
+        from scripts.run_metrics import load_reports
+        runs = load_reports()[-10:]
+        if not runs:
+            print("\n[INFO] No run reports yet.")
+            return
+        print("\nRecent Runs:")
+        for r in runs:
+            slowest = sorted(r["phases"].items(), key=lambda item: -item[1]["seconds"])[:3]
+            phases = ", ".join(f"{name} {p['seconds']:.1f}s" for name, p in slowest)
+            print(f"  {r['started']}  {r['kind']:<13} {r['status']:<6} {r['seconds']:>6.1f}s  ({phases})")
+
+    tk.Button(tab_settings, text="Show Recent Runs", command=show_recent_runs).pack(anchor="w", pady=5)
+
     def change_bar_number():
         new_bar = simpledialog.askstring("Change Bar Number", "Enter new Bar Number:", parent=root)
         if new_bar:
-            config["scraper.bar_number"] = new_bar
-            config["scraper.destination_folder"] = os.path.join(os.path.expanduser("~"), "Desktop", f"{new_bar} Misdemeanor Clients")
-            config["waiver.waiver_output_dir"] = os.path.join(os.path.expanduser("~"), "Desktop", f"{new_bar} Misdemeanor Waivers")
-            save_config(config)
-            reload_config()
+            config.update({
+                "scraper.bar_number": new_bar,
+                "scraper.destination_folder": os.path.join(os.path.expanduser("~"), "Desktop", f"{new_bar} Misdemeanor Clients"),
+                "waiver.waiver_output_dir": os.path.join(os.path.expanduser("~"), "Desktop", f"{new_bar} Misdemeanor Waivers"),
+            })
 
     def change_dest_folder():
         folder = filedialog.askdirectory(title="Select base folder")
         if folder:
-            config["scraper.destination_folder"] = folder
-            save_config(config)
-            reload_config()
+            config.set("scraper.destination_folder", folder)
+
+    def scraper_ready():
+        # No browser is waiting on a CAPTCHA; let the user start another run
+        btn_scrape.config(state='normal')
+        btn_batch.config(state='normal')
+        btn_crawl.config(state='normal')
+        btn_continue.config(state='disabled')
 
     def run_scraper():
         btn_scrape.config(state='disabled')
+        btn_batch.config(state='disabled')
+        btn_crawl.config(state='disabled')
         btn_continue.config(state='normal')
+        continue_event.clear()
+        force_refresh = force_refresh_var.get()
         def target():
             import scripts.scrape_cases as scrape_cases
-            scrape_cases.run_main(continue_event)
+            scrape_cases.run_main(continue_event, force_refresh=force_refresh,
+                                  on_cached=lambda: root.after(0, scraper_ready))
+        threading.Thread(target=target, daemon=True).start()
+
+    def run_batch_scraper():
+        btn_scrape.config(state='disabled')
+        btn_batch.config(state='disabled')
+        btn_crawl.config(state='disabled')
+        btn_continue.config(state='normal')
+        continue_event.clear()
+        def target():
+            import scripts.batch_scrape as batch_scrape
+            batch_scrape.run_batch_main(continue_event)
+        threading.Thread(target=target, daemon=True).start()
+
+    def run_crawler():
+        import scripts.calendar_crawl as calendar_crawl
+        if not config.get(calendar_crawl.WINDOW_URL_KEY):
+            messagebox.showerror("Crawl Calendar",
+                                 f"Set \"{calendar_crawl.WINDOW_URL_KEY}\" in config.json to the court calendar's "
+                                 "date-range URL, using {start} and {end} for the dates, then click Refresh Settings.")
+            return
+        days = simpledialog.askinteger("Crawl Calendar", "Crawl how many days ahead?", initialvalue=30, minvalue=1)
+        if not days:
+            return
+        btn_scrape.config(state='disabled')
+        btn_batch.config(state='disabled')
+        btn_crawl.config(state='disabled')
+        btn_continue.config(state='normal')
+        continue_event.clear()
+        def target():
+            calendar_crawl.run_crawl_main(continue_event, days_ahead=days)
         threading.Thread(target=target, daemon=True).start()
 
     def continue_scraping():
@@ -163,6 +266,13 @@ def run_gui():
     tk.Button(tab_scraper, text="Open Folder", command=lambda: open_folder(config["scraper.destination_folder"])).pack(anchor="w", pady=5)
     btn_scrape = tk.Button(tab_scraper, text="Start Scraper", command=run_scraper)
     btn_scrape.pack(anchor="w", pady=5)
+    force_refresh_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(tab_scraper, text="Force refresh (ignore the cached calendar)",
+                   variable=force_refresh_var).pack(anchor="w")
+    btn_batch = tk.Button(tab_scraper, text="Scrape All Profiles", command=run_batch_scraper)
+    btn_batch.pack(anchor="w", pady=5)
+    btn_crawl = tk.Button(tab_scraper, text="Crawl Date Range", command=run_crawler)
+    btn_crawl.pack(anchor="w", pady=5)
     btn_continue = tk.Button(tab_scraper, text="Continue (after captcha)", command=continue_scraping)
     btn_continue.pack(anchor="w", pady=5)
     btn_continue.config(state='disabled')
@@ -174,16 +284,12 @@ def run_gui():
             ]
         )
         if img:
-            config["waiver.signature_image_path"] = img
-            save_config(config)
-            reload_config()
+            config.set("waiver.signature_image_path", img)
 
     def set_waiver_output():
         folder = filedialog.askdirectory(title="Select output folder")
         if folder:
-            config["waiver.waiver_output_dir"] = folder
-            save_config(config)
-            reload_config()
+            config.set("waiver.waiver_output_dir", folder)
 
     def run_waiver_generator():
         sig_path = config.get("waiver.signature_image_path")
@@ -196,6 +302,7 @@ def run_gui():
             return
         btn_waiver_run.config(state='disabled')
         btn_waiver_continue.config(state='normal')
+        waiver_event.clear()
         def target():
             import scripts.create_waivers as create_waivers
             create_waivers.main(waiver_event)
@@ -226,11 +333,46 @@ def run_gui():
 
     output_box = scrolledtext.ScrolledText(footer_frame, state='disabled', width=80, height=12, wrap='word')
     output_box.pack()
-    sys.stdout = StdoutRedirector(output_box)
-    sys.stderr = StdoutRedirector(output_box)
+    log_sink = QueueLogSink(log_path())
+    sys.stdout = log_sink
+    sys.stderr = log_sink
+    attach_log_view(root, output_box, log_sink)
 
     continue_event = threading.Event()
     waiver_event = threading.Event()
+
+    # The GUI owns the shared browser pool; close Chrome and chromedriver with the window
+    def on_close():
+        shutdown_pool()
+        log_sink.drain(sys.maxsize)  # whatever is still queued goes to the log file
+        root.destroy()
+
+    # Start Chrome (and open the calendar) while the user is still on the GUI,
+    # so clicking a scraper button goes straight to the CAPTCHA
+    def prewarm_browser():
+        if config.get(PREWARM_CONFIG_KEY, "tab") != "off":
+            from scripts.calendar_parser import CALENDAR_URL
+            get_pool().prewarm(CALENDAR_URL)
+
+    def on_tab_changed(event):
+        if notebook.nametowidget(notebook.select()) in (tab_scraper, tab_waivers):
+            prewarm_browser()
+
+    # Apply config changes to the running app (scrapers read the store on each run)
+    def on_config_changed(changed):
+        if IDLE_CONFIG_KEY in changed:
+            get_pool().set_idle_timeout(idle_timeout_from_config(config))
+        if RATE_CONFIG_KEY in changed:
+            configure_from(config)
+        root.after(0, update_settings_tab)
+
+    config.subscribe(on_config_changed)
+    get_pool().set_idle_timeout(idle_timeout_from_config(config))
+    notebook.bind("<<NotebookTabChanged>>", on_tab_changed)
+    if config.get(PREWARM_CONFIG_KEY, "tab") == "startup":
+        root.after(500, prewarm_browser)
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
 def main():
@@ -238,4 +380,7 @@ def main():
     run_gui()
 
 if __name__ == "__main__":
+    # Waiver rendering uses a process pool; frozen Windows builds need this first
+    import multiprocessing
+    multiprocessing.freeze_support()
     main()
@@ -60,23 +60,50 @@
 #     - Uses the first page as a template for all overlay pages
 #     - Maintains clean formatting and spacing per page
 
+# The three agency lookups run at the same time, each in its own browser
+# window; only one ENTER prompt is shown at a time, so steps that need a human
+# (CAPTCHAs, picking a result) queue up while the automated ones keep going.
+
+# # Batch mode: FavoriteButton.py --batch ubis.txt [--workers N] [--unattended]
+# Reads one UBI per line (blank lines and # comments ignored) and runs them
+# through a pipeline: up to N UBIs are looked up at once, and each finished
+# lookup is handed to a single PDF writer through a short queue, producing one
+# "<date> <UBI> Intake Form.pdf" per UBI. Every finished UBI is recorded in
+# "<list name> journal.json" in the output folder, so rerunning the same
+# command after an interruption only does the UBIs that are not done yet.
+# --unattended answers ';' (skip) to every ENTER prompt, so the run needs no one
+# at the keyboard; agencies that need a human are then left as "Not found".
+# --lni-http fetches the LNI detail pages in parallel over HTTP with the
+# browser's cookies; any page that comes back without contractor data is then
+# loaded in the browser as usual.
+
 # FavoriteButton.py — One-File Intake Script
 import os
 import sys
+import json
 import time
+import queue
+import argparse
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
 from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from io import BytesIO
-import re
+
+from extractors import LNI_DETAIL_FIELDS, LNI_CONTRACTOR_NAME, LNI_RESULT_ITEMS, parse_html
+from LNI import open_lni_and_get_detail_page_links, fetch_detail_html, browser_detail_html, lni_session
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))  # scripts/, for navigation.py, text_layout.py and run_metrics.py
+from navigation import Navigator, id_present, css_present, replaced
+from text_layout import wrap, paginate
+import run_metrics
 
 # --- CONFIG ---
 SCRIPT_PATH = os.path.abspath(__file__)
@@ -86,10 +113,17 @@ CHROMEDRIVER_BINARY = os.path.join(BASE_DIR, "chromedriver-win64", "chromedriver
 PDF_TEMPLATE = os.path.join(BASE_DIR, "assets", "0000 New Matter Form.pdf")
 OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 
+# LNI continuation pages: canvas default font, 30 lines from y=720 down
+LNI_FONT_SIZE = 12
+LNI_LEFT, LNI_TOP, LNI_LEADING = 80, 720, 20
+LNI_TEXT_WIDTH = letter[0] - LNI_LEFT - 40
+LNI_LINES_PER_PAGE = 30
+
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
 # --- HELPERS ---
+@run_metrics.timed("browser launch")
 def init_driver():
     options = Options()
     options.binary_location = CHROME_BINARY
@@ -97,8 +131,17 @@ def init_driver():
     options.add_argument("--disable-dev-shm-usage")
     return webdriver.Chrome(service=Service(CHROMEDRIVER_BINARY), options=options)
 
+_prompt_lock = threading.Lock()
+unattended = False  # set by --unattended: skip every prompt instead of asking
+
+@run_metrics.timed("user wait")
 def wait_for_continue(prompt="Press ENTER to continue, or ';' to skip."):
-    resp = input(prompt)
+    if unattended:
+        print(f"{prompt.rstrip()} -> skipped (unattended)")
+        return False
+    # Lookups run in parallel; ask one question at a time
+    with _prompt_lock:
+        resp = input(prompt)
     if resp.strip() == ";":
         return False
     return True
@@ -109,8 +152,7 @@ def wait_for_continue(prompt="Press ENTER to continue, or ';' to skip."):
 def get_sos_info(driver, ubi):
     try:
         driver.get(f"https://ccfs.sos.wa.gov/#/BusinessSearch/UBI/{ubi}")
-        print("SOS loaded. Press ENTER after navigating to the detail view.", end="")
-        if not wait_for_continue():
+        if not wait_for_continue(f"\n[SOS {ubi}] Press ENTER after navigating to the detail view, or ';' to skip. "):
             return {"status": "Not found"}
 
         # TODO: Add live scraping here — this is from debug HTML for now
@@ -142,15 +184,35 @@ def get_sos_info(driver, ubi):
         return {"status": "error"}
 
 
+lni_http = False  # set by --lni-http: fetch LNI detail pages over HTTP, falling back to the browser
+
 def get_lni_info(driver, ubi):
+    """Search LNI by UBI and load the contractor detail pages without help if possible."""
+    nav = Navigator(driver)
+    detail_urls = open_lni_and_get_detail_page_links(driver, ubi, nav)
+    if not detail_urls:
+        print("ℹ️  Automatic LNI search found no contractors; switching to a manual search.")
+        return get_lni_info_manual(driver, ubi)
+
+    list_html = driver.page_source
+    if lni_http:
+        with lni_session(driver) as session:
+            detail_htmls = fetch_detail_html(detail_urls, session)
+    else:
+        detail_htmls = [None] * len(detail_urls)
+    detail_htmls = [html if html is not None else browser_detail_html(driver, url, nav, idx)
+                    for idx, (url, html) in enumerate(zip(detail_urls, detail_htmls))]
+    print(nav.summary())
+    return get_lni_info_from_html(list_html, [html for html in detail_htmls if html is not None])
+
+def get_lni_info_manual(driver, ubi):
     from selenium.common.exceptions import (
         TimeoutException, StaleElementReferenceException, WebDriverException
     )
 
     try:
         driver.get("https://secure.lni.wa.gov/verify/")
-        print("LNI loaded. Use the search box to look up the contractor. Press ENTER when the result list appears.")
-        if not wait_for_continue():
+        if not wait_for_continue(f"\n[LNI {ubi}] Use the search box to look up the contractor. Press ENTER when the result list appears, or ';' to skip. "):
             return {"status": "Not found"}
 
         temp_dir = os.path.join(BASE_DIR, "temp_html_files")
@@ -163,6 +225,7 @@ def get_lni_info(driver, ubi):
 
         list_url = driver.current_url
         contractors = []
+        nav = Navigator(driver)
 
         result_divs = driver.find_elements(By.CSS_SELECTOR, "div.resultItem")
         if not result_divs:
@@ -180,13 +243,8 @@ def get_lni_info(driver, ubi):
 
                 contractor_elem = result_divs[idx]
                 driver.execute_script("arguments[0].scrollIntoView(true);", contractor_elem)
-                contractor_elem.click()
-
-                # Wait for a reliable anchor in the contractor detail page
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "layoutContainer"))
-                )
-                time.sleep(5)  # slight buffer to ensure render
+                # Open the detail page and wait for a reliable anchor in it
+                nav.click(contractor_elem, ready=replaced(contractor_elem, id_present("layoutContainer")))
 
                 html = driver.page_source
                 detail_path = os.path.join(temp_dir, f"lni_detail_{idx + 1}.html")
@@ -211,15 +269,13 @@ def get_lni_info(driver, ubi):
                 print(f"⚠️  Contractor #{idx + 1} navigation error: {e}")
             finally:
                 # Return to results list page
-                driver.get(list_url)
                 try:
-                    WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.resultItem"))
-                    )
+                    nav.get(list_url, ready=css_present("div.resultItem"))
                 except TimeoutException:
                     print("⚠️  Could not return to result list from detail page.")
                     break
 
+        print(nav.summary())
         return contractors
 
     except Exception as e:
@@ -230,68 +286,17 @@ def get_lni_info(driver, ubi):
 def get_lni_info_from_html(list_html: str, detail_htmls: list[str]) -> list[dict]:
     contractors = []
     print("\n🔧 Parsing LNI Result List Page")
-    list_soup = BeautifulSoup(list_html, "html.parser")
-    result_divs = list_soup.select("div.resultItem")
+    result_divs = LNI_RESULT_ITEMS(parse_html(list_html))
     print(f"Found {len(result_divs)} contractor result(s).")
 
     print("\n🔧 Parsing LNI Detail Pages")
     for idx, detail_html in enumerate(detail_htmls):
-        soup = BeautifulSoup(detail_html, "html.parser")
-        info = {}
-
-        contractor_name_tag = soup.select_one("div.hdrText")
-        contractor_name = contractor_name_tag.get_text(strip=True) if contractor_name_tag else f"Contractor #{idx + 1}"
+        root = parse_html(detail_html)
+        contractor_name = LNI_CONTRACTOR_NAME.extract(root).get("name", f"Contractor #{idx + 1}")
         print(f"\n📄 {contractor_name} Detail Page:")
 
-        # --- Simple key-value rows ---
-        for table in soup.select("table"):
-            for row in table.select("tr"):
-                cols = row.find_all("td")
-                if len(cols) >= 2:
-                    label = cols[0].get_text(strip=True).rstrip(":")
-                    value = cols[1].get_text(strip=True)
-
-                    if "Registration #" in label:
-                        info["Registration Number"] = value
-                    elif "License Suspended" in label:
-                        info["License Suspended"] = value
-                    elif "Insurance Company" in label:
-                        info["Insurance Company"] = value
-                    elif "Insurance Amount" in label:
-                        info["Insurance Amount"] = value
-
-        # --- Bonds ---
-        bonds = []
-        for h4 in soup.find_all("h4", string=re.compile("Bond Information", re.I)):
-            bond_table = h4.find_next("table")
-            if bond_table:
-                for row in bond_table.select("tr")[1:]:
-                    cols = [td.get_text(strip=True) for td in row.select("td")]
-                    if len(cols) >= 3:
-                        bonds.append({
-                            "Bonding Company": cols[0],
-                            "Bond Number": cols[1],
-                            "Amount": cols[2],
-                        })
-        if bonds:
-            info["Bonds"] = bonds
-
-        # --- Lawsuits ---
-        lawsuits = []
-        for h4 in soup.find_all("h4", string=re.compile("Lawsuits", re.I)):
-            lawsuit_table = h4.find_next("table")
-            if lawsuit_table:
-                for row in lawsuit_table.select("tr")[1:]:
-                    cols = [td.get_text(strip=True) for td in row.select("td")]
-                    if len(cols) >= 4:
-                        lawsuits.append({
-                            "Case Number": cols[0],
-                            "County": cols[1],
-                            "Parties": cols[2],
-                            "Status": cols[3],
-                        })
-        if lawsuits:
-            info["Lawsuits"] = lawsuits
+        # Registration/insurance rows, bond table and lawsuit table (see extractors.py)
+        info = LNI_DETAIL_FIELDS.extract(root)
 
         # --- Output Summary ---
         if info:
@@ -309,11 +314,10 @@ def get_lni_info_from_html(list_html: str, detail_htmls: list[str]) -> list[dict
     return contractors
 
 
-def get_dor_info(driver):
+def get_dor_info(driver, ubi):
     try:
         driver.get("https://secure.dor.wa.gov/gteunauth/_/#1")
-        print("DOR loaded. Complete CAPTCHA and select business, then ENTER.", end="")
-        if not wait_for_continue():
+        if not wait_for_continue(f"\n[DOR {ubi}] Complete the CAPTCHA and select the business, then press ENTER, or ';' to skip. "):
             return {"status": "Not found"}
 
         return {"status": "Not implemented"}
@@ -323,9 +327,54 @@ def get_dor_info(driver):
 
 # --- PDF ---
 
-def fill_pdf(sos, lni_contractors, dor, output_path):
+def overlay_page(draw):
+    packet = BytesIO()
+    can = canvas.Canvas(packet, pagesize=letter)
+    draw(can)
+    can.save()
+    packet.seek(0)
+    return PdfReader(packet).pages[0]
+
+def add_object(writer, obj):
+    # pypdf 5.x has no public call that registers an indirect object; _add_object
+    # is what PdfWriter itself uses for that. Prefer a public add_object if the
+    # installed pypdf has one.
+    add = getattr(writer, "add_object", None) or writer._add_object
+    return add(obj)
+
+def template_xobject(writer, template):
+    """Store the template page's content once in writer, as a form XObject."""
+    resources = template["/Resources"].clone(writer)
+    xobject = DecodedStreamObject()
+    xobject.set_data(template.get_contents().get_data())
+    xobject.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): ArrayObject(template.mediabox),
+        NameObject("/Resources"): resources.indirect_reference or resources,
+    })
+    return add_object(writer, xobject.flate_encode())
+
+def add_template_page(writer, template, mediabox):
+    """Append a page that only draws the shared template XObject.
+
+    merge_page() rewrites a writer page's content object in place, so each
+    page gets its own small content stream and resources rather than sharing
+    the template page's.
+    """
+    page = writer.add_blank_page(mediabox.width, mediabox.height)
+    content = DecodedStreamObject()
+    content.set_data(b"q /Tpl Do Q\n")
+    page[NameObject("/Contents")] = add_object(writer, content)
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/XObject"): DictionaryObject({NameObject("/Tpl"): template}),
+    })
+    return page
+
+@run_metrics.timed("pdf render")
+def fill_pdf(sos, lni_contractors, dor, output_path, template_path=PDF_TEMPLATE):
     print(f"\n📝 Generating filled PDF at:\n{output_path}")
-    reader = PdfReader(PDF_TEMPLATE)
+    reader = PdfReader(template_path)
     writer = PdfWriter()
 
     def draw_sos(can):
@@ -344,8 +393,6 @@ def fill_pdf(sos, lni_contractors, dor, output_path):
 
     # Create LNI pages with multiple contractors
     def create_lni_pages():
-        pages = []
-        max_lines_per_page = 30
         lines = []
 
         for idx, contractor in enumerate(lni_contractors):
@@ -364,68 +411,254 @@ def fill_pdf(sos, lni_contractors, dor, output_path):
 
             lines.append("")  # spacer
 
-        # Break into pages
-        for i in range(0, len(lines), max_lines_per_page):
-            page_lines = lines[i:i + max_lines_per_page]
-            pages.append(page_lines)
+        # Wrap long bond/lawsuit/party lines, then break into pages
+        wrapped = []
+        for line in lines:
+            indent = line[:len(line) - len(line.lstrip())] + "    "
+            wrapped.extend(wrap(line, LNI_TEXT_WIDTH, "Helvetica", LNI_FONT_SIZE, indent=indent) if line else [line])
+        return paginate(wrapped, LNI_LINES_PER_PAGE)
 
-        return pages
-
-    # Render first page
-    packet = BytesIO()
-    can = canvas.Canvas(packet, pagesize=letter)
-    draw_sos(can)
-    draw_dor(can)
-    can.drawString(100, 540, "LNI contractors (see next pages if more):")
-    can.save()
+    # Render first page on a real copy of the template (keeps its form widgets)
+    def draw_first_page(can):
+        draw_sos(can)
+        draw_dor(can)
+        can.drawString(100, 540, "LNI contractors (see next pages if more):")
 
-    packet.seek(0)
-    overlay_pdf = PdfReader(packet)
-    first_page = reader.pages[0]
-    first_page.merge_page(overlay_pdf.pages[0])
-    writer.add_page(first_page)
+    first_page = writer.add_page(reader.pages[0])
+    first_page.merge_page(overlay_page(draw_first_page))
 
-    # Render LNI detail pages
+    # Render LNI detail pages, each drawing the shared template plus only its own lines
     lni_pages = create_lni_pages()
+    if lni_pages:
+        template = template_xobject(writer, reader.pages[0])
     for page_lines in lni_pages:
-        packet = BytesIO()
-        can = canvas.Canvas(packet, pagesize=letter)
-        y = 720
-        for line in page_lines:
-            can.drawString(80, y, line)
-            y -= 20
-        can.save()
-        packet.seek(0)
-        overlay_pdf = PdfReader(packet)
-        new_page = reader.pages[0]
-        new_page.merge_page(overlay_pdf.pages[0])
-        writer.add_page(new_page)
+        def draw_lni_page(can):
+            y = LNI_TOP
+            for line in page_lines:
+                can.drawString(LNI_LEFT, y, line)
+                y -= LNI_LEADING
+        new_page = add_template_page(writer, template, reader.pages[0].mediabox)
+        new_page.merge_page(overlay_page(draw_lni_page))
 
     with open(output_path, "wb") as f:
         writer.write(f)
 
-# --- MAIN ---
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: FavoriteButton.py <UBI>")
-        sys.exit(1)
-
-    ubi = sys.argv[1]
-    print(f"\n🔍 Looking up UBI: {ubi}\n")
+# --- LOOKUPS ---
+LOOKUPS = (
+    ("sos", get_sos_info),
+    ("lni", get_lni_info),
+    ("dor", get_dor_info),
+)
+# What fill_pdf gets if a lookup fails outright
+FAILED_RESULTS = {"sos": {"status": "error"}, "lni": [], "dor": {"status": "error"}}
 
+def lookup(name, get_info, ubi):
     driver = init_driver()
-
     try:
-        sos = get_sos_info(driver, ubi)
-        lni = get_lni_info(driver, ubi)
-        dor = get_dor_info(driver)
+        with run_metrics.phase(f"{name} lookup"):
+            return get_info(driver, ubi)
     finally:
         driver.quit()
 
-    output_filename = datetime.now().strftime("%Y-%m-%d Intake Form.pdf")
-    output_path = os.path.join(OUTPUT_DIR, output_filename)
+def run_lookups(ubi):
+    """Run every agency lookup at once in its own browser; returns {name: result}."""
+    results = dict(FAILED_RESULTS)
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=len(LOOKUPS)) as executor:
+        futures = {executor.submit(run_metrics.bind(lookup), name, get_info, ubi): name for name, get_info in LOOKUPS}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+                print(f"\n✅ {name.upper()} lookup done after {time.monotonic() - start:.1f}s")
+            except Exception as e:
+                print(f"\n🚨 {name.upper()} lookup failed: {e}")
+    # get_lni_info reports errors as a status dict; fill_pdf wants a contractor list
+    if not isinstance(results["lni"], list):
+        results["lni"] = []
+    return results
+
+# --- BATCH ---
+BATCH_WORKERS = 2  # UBIs looked up at once; each one opens a browser per agency
+
+def read_ubis(path):
+    """UBIs from a text file, one per line, in order and without repeats.
+
+    Spaces inside a UBI ("602 123 456") are dropped; lines that are not
+    digits after that are reported and skipped.
+    """
+    ubis = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            ubi = "".join(line.split("#", 1)[0].split())
+            if not ubi:
+                continue
+            if not (ubi.isascii() and ubi.isdigit()):
+                print(f"⚠️ {path}:{line_number}: skipping {ubi!r}, a UBI is digits only")
+                continue
+            if ubi not in ubis:
+                ubis.append(ubi)
+    return ubis
+
+def journal_path(list_path):
+    name = os.path.splitext(os.path.basename(list_path))[0]
+    return os.path.join(OUTPUT_DIR, f"{name} journal.json")
+
+class IntakeJournal:
+    """Outcome of each UBI in a batch, rewritten after every UBI so a rerun can resume."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)["ubis"]
+        except (KeyError, FileNotFoundError, json.JSONDecodeError):
+            self.entries = {}
+
+    def done(self, ubi):
+        entry = self.entries.get(ubi, {})
+        return entry.get("status") == "done" and os.path.exists(entry.get("output", ""))
+
+    def record(self, ubi, status, **details):
+        with self._lock:
+            self.entries[ubi] = {"status": status, "finished": datetime.now().isoformat(timespec="seconds"), **details}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"ubis": self.entries}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+def intake_output_path(ubi):
+    return os.path.join(OUTPUT_DIR, f"{datetime.now():%Y-%m-%d} {ubi} Intake Form.pdf")
+
+def lookup_ubi(ubi):
+    start = time.monotonic()
+    results = run_lookups(ubi)
+    return results, time.monotonic() - start
+
+def run_batch(ubis, journal, workers=BATCH_WORKERS):
+    """Look up ubis on `workers` threads and write their PDFs on one more; returns per-UBI outcomes."""
+    outcomes = {}
+    to_render = queue.Queue(maxsize=workers)  # lookups wait here if PDF writing falls behind
+
+    def render(ubi, results, lookup_seconds):
+        start = time.monotonic()
+        output_path = intake_output_path(ubi)
+        fill_pdf(results["sos"], results["lni"], results["dor"], output_path)
+        return {"status": "done", "output": output_path, "lni contractors": len(results["lni"]),
+                "lookup seconds": round(lookup_seconds, 1),
+                "render seconds": round(time.monotonic() - start, 1)}
+
+    def render_worker():
+        # Must outlive any one bad UBI: if this thread died, hand_off would block on the full queue
+        while (item := to_render.get()) is not None:
+            ubi = item[0]
+            try:
+                outcomes[ubi] = render(*item)
+            except Exception as e:
+                print(f"🚨 {ubi}: could not write the intake form: {e}")
+                outcomes[ubi] = {"status": "failed", "error": f"pdf: {e}"}
+            try:
+                journal.record(ubi, **outcomes[ubi])
+            except Exception as e:
+                print(f"🚨 {ubi}: could not update the journal {journal.path}: {e}")
+            run_metrics.count(f"ubis {outcomes[ubi]['status']}")
+
+    def hand_off(ubi, future):
+        # Main thread: journal a failed lookup, or queue the results for the PDF writer
+        try:
+            results, lookup_seconds = future.result()
+        except Exception as e:
+            print(f"🚨 {ubi}: lookup failed: {e}")
+            outcomes[ubi] = {"status": "failed", "error": f"lookup: {e}"}
+            journal.record(ubi, **outcomes[ubi])
+            run_metrics.count("ubis failed")
+            return
+        print(f"\n📬 {ubi}: lookups done in {lookup_seconds:.1f}s, queued for the intake form")
+        to_render.put((ubi, results, lookup_seconds))
+
+    renderer = threading.Thread(target=run_metrics.bind(render_worker), daemon=True)
+    renderer.start()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = {}
+    handed_off = set()
+    try:
+        for ubi in ubis:
+            futures[executor.submit(run_metrics.bind(lookup_ubi), ubi)] = ubi
+        for future in as_completed(futures):
+            hand_off(futures[future], future)
+            handed_off.add(future)
+    except KeyboardInterrupt:
+        print("\n⛔ Interrupted; finishing the UBIs in progress. Rerun the same command to resume.")
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Lookups that were in flight still get their intake form and journal entry
+        for future, ubi in futures.items():
+            if future not in handed_off and future.done() and not future.cancelled():
+                hand_off(ubi, future)
+    finally:
+        executor.shutdown(wait=True)
+        to_render.put(None)
+        renderer.join()
+    return outcomes
+
+def batch_summary(outcomes, skipped, seconds):
+    done = [o for o in outcomes.values() if o["status"] == "done"]
+    failed = {ubi: o for ubi, o in outcomes.items() if o["status"] != "done"}
+    lines = [f"\nBatch Summary: {len(done)} done, {len(failed)} failed, {skipped} already done, {seconds / 60:.1f} min"]
+    if done:
+        lines.append(f"  throughput:       {len(done) / (seconds / 60):.1f} UBIs/min")
+        lines.append(f"  lookup per UBI:   {sum(o['lookup seconds'] for o in done) / len(done):.1f}s avg")
+        lines.append(f"  render per UBI:   {sum(o['render seconds'] for o in done) / len(done):.1f}s avg")
+    for ubi, o in failed.items():
+        lines.append(f"  ❌ {ubi}: {o['error']}")
+    return "\n".join(lines) + "\n"
+
+def batch_main(list_path, workers):
+    ubis = read_ubis(list_path)
+    journal = IntakeJournal(journal_path(list_path))
+    pending = [ubi for ubi in ubis if not journal.done(ubi)]
+    skipped = len(ubis) - len(pending)
+    print(f"\n📋 {len(ubis)} UBIs in {list_path}: {skipped} already done, {len(pending)} to go")
+    print(f"🗒️  Journal: {journal.path}\n")
+
+    start = time.monotonic()
+    with run_metrics.run("intake batch", ubis=len(pending), workers=workers):
+        outcomes = run_batch(pending, journal, workers)
+        print(batch_summary(outcomes, skipped, time.monotonic() - start))
+    return all(o["status"] == "done" for o in outcomes.values()) and len(outcomes) == len(pending)
+
+# --- MAIN ---
+def main():
+    global unattended, lni_http
+    parser = argparse.ArgumentParser(description="Fill a New Matter Form from SOS, LNI and DOR lookups.")
+    parser.add_argument("ubi", nargs="?", help="UBI to look up")
+    parser.add_argument("--batch", metavar="UBI_LIST", help="text file with one UBI per line; resumes an interrupted run")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="UBIs looked up at once in --batch mode")
+    parser.add_argument("--unattended", action="store_true", help="skip every ENTER prompt instead of waiting")
+    parser.add_argument("--lni-http", action="store_true", help="fetch LNI detail pages over HTTP instead of in the browser")
+    args = parser.parse_args()
+    if not args.ubi and not args.batch:
+        parser.error("give a UBI or --batch UBI_LIST")
+    unattended = args.unattended
+    lni_http = args.lni_http
+
+    if args.batch:
+        sys.exit(0 if batch_main(args.batch, max(1, args.workers)) else 1)
+
+    ubi = args.ubi
+    print(f"\n🔍 Looking up UBI: {ubi}\n")
+
+    # Lookups overlap, so intake takes about as long as the slowest one. Their
+    # phases include time spent waiting on ENTER ("user wait").
+    with run_metrics.run("intake", ubi=ubi):
+        results = run_lookups(ubi)
+        sos, lni, dor = results["sos"], results["lni"], results["dor"]
+        run_metrics.count("lni contractors", len(lni))
+
+        output_filename = datetime.now().strftime("%Y-%m-%d Intake Form.pdf")
+        output_path = os.path.join(OUTPUT_DIR, output_filename)
 
-    fill_pdf(sos, lni, dor, output_path)
+        fill_pdf(sos, lni, dor, output_path)
 
 if __name__ == "__main__":
     main()
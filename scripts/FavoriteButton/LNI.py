@@ -1,25 +1,45 @@
 # scripts/FavoriteButton/lni.py
-import os, time, re
+import os, re, sys
 from datetime import datetime
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException
 
+from extractors import LNI_CONTRACTOR_FIELDS, LNI_RESULT_ITEMS, parse_html
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))  # scripts/, for navigation.py
+from navigation import Navigator, id_present, css_present, bucket_for
+
 TEMP_HTML_DIR = os.path.join(os.path.dirname(__file__), "..", "temp_html_files")
 os.makedirs(TEMP_HTML_DIR, exist_ok=True)
 
-def lni(driver, ubi):
+# Detail pages over plain HTTP (opt-in): parallel requests on one keep-alive
+# session, still throttled by navigation's per-host token bucket. A response
+# only counts if the contractor data is in it (a filled-in business name
+# header), not just the page wrapper; anything else is loaded in the browser.
+LNI_HTTP_WORKERS = 8
+LNI_HTTP_TIMEOUT = 10
+DETAIL_READY = re.compile(
+    r"""(?:id\s*=\s*["']BusinessName["']|class\s*=\s*["'][^"']*\bhdrText\b[^"']*["'])[^>]*>\s*[^<\s]"""
+)
+
+def lni(driver, ubi, http=False):
     # First, use a monster function to open the lni page,
     # perform a search by UBI number,
     # and save links from the search results to their detail pages
-    detail_page_links = open_lni_and_get_detail_page_links(driver, ubi)
+    nav = Navigator(driver)
+    detail_page_links = open_lni_and_get_detail_page_links(driver, ubi, nav)
 
     
-    # navigate to each result's detail page,
+    # navigate to each result's detail page (or fetch them all at once over HTTP),
     # and save each result's detail page as an HTML file
-    filepaths = save_detail_to_html(driver, detail_page_links)
+    if http:
+        filepaths = save_detail_to_html_http(driver, detail_page_links, nav)
+    else:
+        filepaths = save_detail_to_html(driver, detail_page_links, nav)
+    print(nav.summary())
 
     # Next, create an empty list for holding parsed information from the HTML files
     parsed_details_list = []
@@ -41,18 +61,15 @@ def lni(driver, ubi):
     return parsed_details_list
 
 # lni ubi search and detail page link grabbing
-def open_lni_and_get_detail_page_links(driver, ubi):
+def open_lni_and_get_detail_page_links(driver, ubi, nav=None):
+    nav = nav or Navigator(driver)
     print("🌐 Navigating to LNI site...")
-    driver.get("https://secure.lni.wa.gov/verify/")
-    time.sleep(2)
 
     try:
         print("⏳ Waiting for search type dropdown...")
-        dropdown = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, "selSearchType"))
-        )
+        nav.get("https://secure.lni.wa.gov/verify/", ready=id_present("selSearchType"))
+        dropdown = driver.find_element(By.ID, "selSearchType")
         Select(dropdown).select_by_value("Ubi")
-        time.sleep(2)
 
         WebDriverWait(driver, 5).until(
             EC.visibility_of_element_located((By.ID, "txtSearchBy"))
@@ -61,13 +78,11 @@ def open_lni_and_get_detail_page_links(driver, ubi):
         ubi_input.send_keys(ubi)
 
         search_btn = driver.find_element(By.ID, "searchButton")
+        nav.throttle(driver.current_url)
         search_btn.click()
         print("🖱️ Clicked Search button")
-        time.sleep(2)
         print("⌛ Waiting for a div.resultitem to load...")
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.resultItem"))
-        )
+        nav.wait_for(css_present("div.resultItem"))
 
         print("💾 Saving search results page...")
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -76,8 +91,7 @@ def open_lni_and_get_detail_page_links(driver, ubi):
             f.write(driver.page_source)
         print(f"✅ Search results page saved to {html_path}")
 
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        result_divs = soup.select("div.resultItem")
+        result_divs = LNI_RESULT_ITEMS(parse_html(driver.page_source))
         print(f"🔗 Extracting contractor detail URLs from {len(result_divs)} result items...")
 
         base_detail_url = "https://secure.lni.wa.gov/verify/Detail.aspx?"
@@ -98,71 +112,104 @@ def open_lni_and_get_detail_page_links(driver, ubi):
         return []
      
 # lni detail page opening and html filesaving
-def save_detail_to_html(driver, detail_urls):
+def write_detail_html(idx, html):
+    detail_path = os.path.join(TEMP_HTML_DIR, f"lni_detail_{idx + 1}.html")
+    with open(detail_path, "w", encoding="utf-8") as f:
+        print(f"🪶 Writing detail HTML to: {detail_path}")
+        f.write(html)
+    print(f"✅ Saved contractor detail HTML #{idx + 1} to: {detail_path}")
+    return detail_path
+
+def browser_detail_html(driver, url, nav, idx):
+    """Load one detail page in the browser; returns its HTML, or None if it didn't load."""
+    try:
+        print(f"\n➡️  Navigating to contractor detail page #{idx + 1}...")
+        print("⌛ Waiting for a id.layoutContainer to load...")
+        nav.get(url, ready=id_present("layoutContainer"))
+        print("💾 Saving contractor detail page...")
+        return driver.page_source
+    except TimeoutException:
+        print(f"⚠️ Contractor detail page #{idx + 1} failed to load expected content.")
+    except (StaleElementReferenceException, WebDriverException) as e:
+        print(f"⚠️ Contractor #{idx + 1} navigation error: {e}")
+    return None
+
+def save_detail_to_html(driver, detail_urls, nav=None):
+    nav = nav or Navigator(driver)
     contractor_detail_html_list = []
     try:
         for idx, url in enumerate(detail_urls):
-            try:
-                print(f"\n➡️  Navigating to contractor detail page #{idx + 1}...")
-                driver.get(url)
-                time.sleep(2)
-
-                print("⌛ Waiting for a id.layoutContainer to load...")
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "layoutContainer"))
-                )
-
-                print("💾 Saving contractor detail page...")
-                html = driver.page_source
-                detail_path = os.path.join(TEMP_HTML_DIR, f"lni_detail_{idx + 1}.html")
-                with open(detail_path, "w", encoding="utf-8") as f:
-                    print(f"🪶 Writing detail HTML to: {detail_path}")
-                    f.write(html)
-                print(f"✅ Saved contractor detail HTML #{idx + 1} to: {detail_path}")
-
-                contractor_detail_html_list.append(detail_path)
-
-            except TimeoutException:
-                print(f"⚠️ Contractor detail page #{idx + 1} failed to load expected content.")
-            except (StaleElementReferenceException, WebDriverException) as e:
-                print(f"⚠️ Contractor #{idx + 1} navigation error: {e}")
+            html = browser_detail_html(driver, url, nav, idx)
+            if html is not None:
+                contractor_detail_html_list.append(write_detail_html(idx, html))
         return contractor_detail_html_list
 
     except Exception as e:
         print(f"🚨 LNI navigation error: {e}")
         return []
 
+# lni detail pages over HTTP
+def lni_session(driver=None, workers=LNI_HTTP_WORKERS):
+    """A keep-alive requests.Session, carrying the browser's cookies and user agent if given a driver."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if driver is not None:
+        session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent")
+        for cookie in driver.get_cookies():
+            session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    return session
+
+def fetch_detail_html(detail_urls, session=None, workers=LNI_HTTP_WORKERS, timeout=LNI_HTTP_TIMEOUT):
+    """Fetch detail pages concurrently; returns their HTML in input order (None where a fetch failed)."""
+    import requests
+    if session is None:
+        with lni_session(workers=workers) as session:
+            return fetch_detail_html(detail_urls, session, workers, timeout)
+
+    def fetch(url):
+        bucket_for(url).acquire()
+        try:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"⚠️ HTTP fetch failed for {url}: {e}")
+            return None
+        if not DETAIL_READY.search(response.text):
+            print(f"⚠️ {url} came back without the contractor details")
+            return None
+        return response.text
+
+    if not detail_urls:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(detail_urls))) as executor:
+        return list(executor.map(fetch, detail_urls))
+
+def save_detail_to_html_http(driver, detail_urls, nav=None, session=None):
+    """save_detail_to_html, fetching the pages over HTTP; any that fail are loaded in the browser."""
+    nav = nav or Navigator(driver)
+    print(f"\n⚡ Fetching {len(detail_urls)} contractor detail page(s) over HTTP...")
+    if session is None:
+        with lni_session(driver) as session:
+            pages = fetch_detail_html(detail_urls, session)
+    else:
+        pages = fetch_detail_html(detail_urls, session)
+    contractor_detail_html_list = []
+    for idx, (url, html) in enumerate(zip(detail_urls, pages)):
+        if html is None:
+            html = browser_detail_html(driver, url, nav, idx)
+        if html is not None:
+            contractor_detail_html_list.append(write_detail_html(idx, html))
+    return contractor_detail_html_list
+
 # parse_lni_contractor_html into a JSON-formatted string
 #   e.g.:
 # {'Business Name': None, 'UBI Number': None, 'Contractor Registration Number': None, 'Bonding Company': None, 'Bond Amount': None, 'Bond Number': None, 'Insurance Company': None, 'Insurance Amount': None, 'Status': None, 'Suspended': None, 'Lawsuits': None}
 def parse_lni_contractor_html(html):
-    soup = BeautifulSoup(html, "html.parser")
-
-    def extract_by_id(id_):
-        tag = soup.find(id=id_)
-        return tag.get_text(strip=True) if tag else None
-
-    def extract_multiple_bond_lawsuit_rows(section_id):
-        section = soup.find(id=section_id)
-        results = []
-        if section:
-            rows = section.find_all("div", class_="bondRow")
-            for row in rows:
-                results.append(" ".join(row.stripped_strings))
-        return results or None
-    
-    result =  {
-        "Business Name": extract_by_id("BusinessName"),
-        "UBI Number": extract_by_id("UBINumber"),
-        "Contractor Registration Number": extract_by_id("RegistrationNumber"),
-        "Bonding Company": extract_by_id("BondingCompany"),
-        "Bond Amount": extract_by_id("BondAmount"),
-        "Bond Number": extract_by_id("BondNumber"),
-        "Insurance Company": extract_by_id("InsuranceCompany"),
-        "Insurance Amount": extract_by_id("InsuranceAmount"),
-        "Status": extract_by_id("Status"),
-        "Suspended": extract_by_id("Suspended"),
-        "Lawsuits": extract_multiple_bond_lawsuit_rows("lawsuitsContainer"),
-    }
+    result = LNI_CONTRACTOR_FIELDS.extract(html)
     print(result)
     return(result)
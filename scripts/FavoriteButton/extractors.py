@@ -0,0 +1,209 @@
+# extractors.py
+#     Declarative field maps for the LNI and SOS detail pages.
+#     Each spec compiles its XPath once at import; every page after that only
+#     pays for one lxml parse plus the lookups. Bond and lawsuit tables are
+#     streamed row by row (see iter_rows) instead of scanning every table.
+
+from lxml import etree
+
+def has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+def lower_xpath(expr):
+    return f'translate({expr}, "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")'
+
+def text_of(elem, sep=""):
+    # sep="" matches BeautifulSoup get_text(strip=True), sep=" " matches " ".join(stripped_strings)
+    return sep.join(s.strip() for s in elem.itertext() if s.strip())
+
+def parse_html(html):
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    return etree.HTML(html, etree.HTMLParser(encoding="utf-8"))
+
+# === Field Specs ===
+class Text:
+    """One key, taken from the first element matching `xpath` (None if missing)."""
+    def __init__(self, key, xpath, sep="", keep_missing=True):
+        self.key = key
+        self.sep = sep
+        self.keep_missing = keep_missing
+        self.xpath = etree.XPath(f"({xpath})[1]")
+
+    def apply(self, root, out):
+        found = self.xpath(root)
+        if found:
+            out[self.key] = text_of(found[0], self.sep)
+        elif self.keep_missing:
+            out[self.key] = None
+
+class ById(Text):
+    def __init__(self, key, id_, **kwargs):
+        super().__init__(key, f'//*[@id="{id_}"]', **kwargs)
+
+class Strings:
+    """One key holding the text of every element matching `xpath` (None if empty)."""
+    def __init__(self, key, xpath, sep=" "):
+        self.key = key
+        self.sep = sep
+        self.xpath = etree.XPath(xpath)
+
+    def apply(self, root, out):
+        out[self.key] = [text_of(e, self.sep) for e in self.xpath(root)] or None
+
+class Column:
+    """One key holding the non-empty first-cell text of every row matching `rows_xpath` (always a list)."""
+    def __init__(self, key, rows_xpath):
+        self.key = key
+        self.rows = etree.XPath(rows_xpath)
+        self.first_cell = etree.XPath("(.//td)[1]")
+
+    def apply(self, root, out):
+        values = []
+        for row in self.rows(root):
+            cell = self.first_cell(row)
+            if cell:
+                value = text_of(cell[0])
+                if value:
+                    values.append(value)
+        out[self.key] = values
+
+class LabelRows:
+    """Label/value table rows; `rules` is an ordered list of (label substring, key).
+
+    The first rule whose substring is in a row's label wins, and later rows
+    overwrite earlier ones, same as the old if/elif chains.
+    """
+    def __init__(self, rows_xpath, rules, lower=False):
+        self.rules = rules
+        self.lower = lower
+        self.rows = etree.XPath(rows_xpath)
+        self.cells = etree.XPath("td")
+
+    def apply(self, root, out):
+        for row in self.rows(root):
+            cols = self.cells(row)
+            if len(cols) < 2:
+                continue
+            label = text_of(cols[0]).rstrip(":")
+            if self.lower:
+                label = label.lower()
+            for needle, key in self.rules:
+                if needle in label:
+                    out[key] = text_of(cols[1])
+                    break
+
+class TableAfterHeading:
+    """Rows of the first table after each heading containing `heading` (case-insensitive)."""
+    def __init__(self, key, heading, columns, heading_tag="h4", skip_header=True, keep_empty=False):
+        self.key = key
+        self.columns = columns
+        self.keep_empty = keep_empty
+        self.skip = 1 if skip_header else 0
+        self.headings = etree.XPath(
+            f'//{heading_tag}[contains({lower_xpath("normalize-space(.)")}, "{heading.lower()}")]'
+        )
+        self.table = etree.XPath("following::table[1]")
+        self.rows = etree.XPath(".//tr")
+        self.cells = etree.XPath(".//td")
+
+    def iter_rows(self, root):
+        for heading in self.headings(root):
+            table = self.table(heading)
+            if not table:
+                continue
+            for i, row in enumerate(self.rows(table[0])):
+                if i < self.skip:
+                    continue
+                cols = [text_of(td) for td in self.cells(row)]
+                if len(cols) >= len(self.columns):
+                    yield dict(zip(self.columns, cols))
+
+    def apply(self, root, out):
+        rows = list(self.iter_rows(root))
+        if rows or self.keep_empty:
+            out[self.key] = rows
+
+class HeadedBlocks:
+    """Blocks with a header element (e.g. <strong>) followed by free text, matched like LabelRows."""
+    def __init__(self, blocks_xpath, header_xpath, rules):
+        self.rules = rules
+        self.blocks = etree.XPath(blocks_xpath)
+        self.header = etree.XPath(f"({header_xpath})[1]")
+
+    def apply(self, root, out):
+        for block in self.blocks(root):
+            header = self.header(block)
+            if not header:
+                continue
+            header_text = text_of(header[0])
+            body = text_of(block, " ").replace(header_text, "").strip()
+            header_text = header_text.lower()
+            for needle, key in self.rules:
+                if needle in header_text:
+                    out[key] = body
+                    break
+
+class FieldMap:
+    def __init__(self, *specs):
+        self.specs = specs
+
+    def extract(self, html_or_root):
+        root = parse_html(html_or_root) if isinstance(html_or_root, (str, bytes)) else html_or_root
+        out = {}
+        if root is None:
+            return out
+        for spec in self.specs:
+            spec.apply(root, out)
+        return out
+
+# === LNI (secure.lni.wa.gov/verify/Detail.aspx) ===
+LNI_CONTRACTOR_FIELDS = FieldMap(
+    ById("Business Name", "BusinessName"),
+    ById("UBI Number", "UBINumber"),
+    ById("Contractor Registration Number", "RegistrationNumber"),
+    ById("Bonding Company", "BondingCompany"),
+    ById("Bond Amount", "BondAmount"),
+    ById("Bond Number", "BondNumber"),
+    ById("Insurance Company", "InsuranceCompany"),
+    ById("Insurance Amount", "InsuranceAmount"),
+    ById("Status", "Status"),
+    ById("Suspended", "Suspended"),
+    Strings("Lawsuits", f'//*[@id="lawsuitsContainer"]//div[{has_class("bondRow")}]'),
+)
+
+LNI_DETAIL_FIELDS = FieldMap(
+    LabelRows("//table//tr", [
+        ("Registration #", "Registration Number"),
+        ("License Suspended", "License Suspended"),
+        ("Insurance Company", "Insurance Company"),
+        ("Insurance Amount", "Insurance Amount"),
+    ]),
+    TableAfterHeading("Bonds", "Bond Information", ["Bonding Company", "Bond Number", "Amount"]),
+    TableAfterHeading("Lawsuits", "Lawsuits", ["Case Number", "County", "Parties", "Status"]),
+)
+
+LNI_CONTRACTOR_NAME = FieldMap(Text("name", f'//div[{has_class("hdrText")}]', keep_missing=False))
+LNI_RESULT_ITEMS = etree.XPath(f'//div[{has_class("resultItem")}]')
+
+# === SOS (ccfs.sos.wa.gov business detail) ===
+SOS_DETAIL_FIELDS = FieldMap(
+    LabelRows(f'(//table[{has_class("table")}][{has_class("table-striped")}])[1]//tr', [
+        ("business name", "company_name"),
+        ("business type", "business_type"),
+        ("status", "business_status"),
+        ("formation date", "formation_date"),
+        ("expiration date", "expiration_date"),
+        ("jurisdiction", "jurisdiction"),
+        ("duration", "duration"),
+        ("nature of business", "nature_of_business"),
+    ], lower=True),
+    HeadedBlocks(f'//div[{has_class("col-md-6")}]', ".//strong", [
+        ("principal office street address", "principal_street_address"),
+        ("mailing address", "mailing_address"),
+        ("agent street", "agent_street"),
+        ("agent mailing", "agent_mailing"),
+    ]),
+    Text("registered_agent_name", f'//div[@id="registered-agent"]//span[{has_class("ng-binding")}]', keep_missing=False),
+    Column("governors", '(//table[@id="governor-table"]//tr)[position() > 1]'),
+)
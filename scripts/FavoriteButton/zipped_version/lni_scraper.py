@@ -1,5 +1,4 @@
 import os
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -43,10 +42,12 @@ def get_lni_info(driver, ubi):
                 driver.execute_script("arguments[0].scrollIntoView(true);", contractor_elem)
                 contractor_elem.click()
 
+                # Wait for the list page to go away, then for contractor data
+                # (not just the layout wrapper) on the detail page
+                WebDriverWait(driver, 10).until(EC.staleness_of(contractor_elem))
                 WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "layoutContainer"))
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.hdrText"))
                 )
-                time.sleep(5)
 
                 html = driver.page_source
                 detail_path = os.path.join(temp_dir, f"lni_detail_{idx + 1}.html")
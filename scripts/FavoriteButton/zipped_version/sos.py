@@ -3,7 +3,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import re
-from utils import wait_for_continue
+from .utils import wait_for_continue
 
 def get_sos_info(driver, ubi):
     try:
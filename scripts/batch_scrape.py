@@ -0,0 +1,143 @@
+# scripts/batch_scrape.py
+#
+# Scrape several attorneys' calendars at once. Each profile gets its own
+# browser session from the shared pool (bounded by max_sessions); the user
+# solves the CAPTCHA in every open window and clicks Continue once. Results go
+# to each profile's own destination folder and {bar}_Cases.csv.
+#
+# Profiles live in config.json under "scraper.profiles":
+#   [{"name": "Doug", "bar_number": "12345", "destination_folder": "C:/..."}, ...]
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from scripts.browser_pool import get_pool
+from scripts.calendar_parser import SUNNYSIDE_COURT
+from scripts.calendar_cache import load_snapshot, ttl_from_config
+from scripts.config_store import get_store
+from scripts.navigation import configure_from
+from scripts import scrape_cases, run_metrics
+
+PROFILES_CONFIG_KEY = "scraper.profiles"
+DEFAULT_MAX_SESSIONS = 3
+
+def load_profiles(config):
+    """Copies of the configured profiles with names filled in; raises ValueError if one has no bar number."""
+    profiles = config.get(PROFILES_CONFIG_KEY) or []
+    if not profiles:
+        profiles = [{
+            "name": config.get("scraper.bar_number", "00000"),
+            "bar_number": config.get("scraper.bar_number", "00000"),
+            "destination_folder": config.get("scraper.destination_folder"),
+        }]
+    invalid = [i for i, profile in enumerate(profiles, start=1)
+               if not isinstance(profile, dict) or not str(profile.get("bar_number") or "").strip()]
+    if invalid:
+        raise ValueError(f'"{PROFILES_CONFIG_KEY}" entries {", ".join(map(str, invalid))} have no "bar_number"')
+    return [dict(profile, name=profile.get("name") or profile["bar_number"]) for profile in profiles]
+
+class CaptchaGate:
+    """Lets every session waiting at the time of a Continue click through, then re-arms.
+
+    Sessions that open after the click wait for the next one, so a single
+    continue_event can serve a pool that is smaller than the profile list.
+    """
+    def __init__(self, continue_event):
+        self.event = continue_event
+        self.generation = 0
+        self.cond = threading.Condition()
+
+    def wait(self):
+        with self.cond:
+            arrived = self.generation
+        while True:
+            if self.event.wait(0.2):
+                with self.cond:
+                    if self.generation == arrived:
+                        self.generation += 1
+                        self.event.clear()
+                        self.cond.notify_all()
+            with self.cond:
+                if self.generation != arrived:
+                    return True
+
+def scrape_profile(profile, gate, pool, ttl_seconds):
+    name, bar_number = profile["name"], profile["bar_number"]
+    timings = {"name": name, "bar_number": bar_number, "cached": False}
+    start = time.monotonic()
+
+    cases = load_snapshot(bar_number, SUNNYSIDE_COURT, ttl_seconds)
+    if cases is None:
+        scraper = scrape_cases.Scraper(pool, bar_number, profile.get("destination_folder"))
+        print(f"🧠 [{name}] Complete the CAPTCHA and open bar #{bar_number}'s calendar in its window.")
+        try:
+            scraper.open_browser_and_wait(gate)
+        except Exception:
+            scraper.release(broken=True)
+            raise
+        timings["browser"] = time.monotonic() - start
+        cases = scraper.scrape_cases(process=False)
+    else:
+        timings["cached"] = True
+        timings["browser"] = 0.0
+    timings["scrape"] = time.monotonic() - start - timings["browser"]
+
+    mark = time.monotonic()
+    scrape_cases.process_cases(cases, bar_number, profile.get("destination_folder"))
+    timings["write"] = time.monotonic() - mark
+    timings["cases"] = len(cases)
+    timings["total"] = time.monotonic() - start
+    return timings
+
+def run_batch(profiles, continue_event, max_sessions=DEFAULT_MAX_SESSIONS, pool=None, ttl_seconds=0):
+    pool = pool or get_pool()
+    # Raised only for this batch; single-run features keep the usual limit
+    previous_max_drivers = pool.max_drivers
+    pool.max_drivers = max(previous_max_drivers, max_sessions)
+    try:
+        return _run_batch(profiles, continue_event, max_sessions, pool, ttl_seconds)
+    finally:
+        pool.max_drivers = previous_max_drivers
+
+def _run_batch(profiles, continue_event, max_sessions, pool, ttl_seconds):
+    gate = CaptchaGate(continue_event)
+
+    print(f"[INFO] Batch scraping {len(profiles)} attorney profile(s), up to {max_sessions} browser(s) at once.")
+    results = []
+    # Phases of all profiles add up in one report (so can exceed the wall time)
+    with run_metrics.run("batch scrape", profiles=len(profiles)), \
+            ThreadPoolExecutor(max_workers=max_sessions) as executor:
+        scrape = run_metrics.bind(scrape_profile)
+        futures = {executor.submit(scrape, p, gate, pool, ttl_seconds): p for p in profiles}
+        for future in as_completed(futures):
+            profile = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"🚨 [{profile['name']}] failed: {e}")
+                results.append({"name": profile["name"], "bar_number": profile["bar_number"], "error": str(e)})
+
+    print("\nBatch Summary:")
+    for r in results:
+        if "error" in r:
+            print(f"  {r['name']:<12} ❌ {r['error']}")
+        else:
+            source = "cache" if r["cached"] else f"browser {r['browser']:.1f}s, parse {r['scrape']:.1f}s"
+            print(f"  {r['name']:<12} {r['cases']:>4} cases  ({source}, write {r['write']:.1f}s, total {r['total']:.1f}s)")
+    return results
+
+def run_batch_main(continue_event=None):
+    config = get_store().snapshot()
+    configure_from(config)
+    try:
+        profiles = load_profiles(config)
+    except ValueError as e:
+        print(f"[ERROR] {e}; fix config.json and try again.")
+        return
+    threading.Thread(
+        target=run_batch,
+        args=(profiles, continue_event or threading.Event()),
+        kwargs={"ttl_seconds": ttl_from_config(config)},
+        daemon=True,
+    ).start()
@@ -0,0 +1,332 @@
+# scripts/browser_pool.py
+#
+# One chromedriver service and a small pool of Chrome sessions owned by the
+# DocketBot GUI process. Features borrow a session with acquire() and hand it
+# back with release() instead of launching Chrome and quitting it every run,
+# so a session that already passed the dw.courts CAPTCHA stays usable.
+#
+# The GUI can prewarm() a session in the background when a scraping tab is
+# opened (or at startup, if configured); whichever feature acquires first gets
+# it, waiting only for whatever is left of the Chrome start-up. Sessions left idle for idle_timeout seconds
+# are shut down (and chromedriver with the last of them).
+#
+# Selenium is imported lazily so importing this module costs nothing at startup.
+
+import os
+import sys
+import time
+import threading
+from urllib.parse import urlparse
+
+from scripts.navigation import Navigator
+
+DEFAULT_MAX_DRIVERS = 2
+DEFAULT_MAX_PAGES = 50        # recycle a session after this many page loads
+DEFAULT_MAX_HEAP_MB = 512     # ...or once the page's JS heap grows past this
+PAGE_LOAD_TIMEOUT = 10
+DEFAULT_IDLE_TIMEOUT = 15 * 60  # seconds an unused session is kept open
+IDLE_CONFIG_KEY = "browser.idle_shutdown_minutes"
+PREWARM_CONFIG_KEY = "browser.prewarm"  # "tab" (when a scraping tab is opened), "startup" or "off"
+
+def resource_path(path):
+    base = getattr(sys, "_MEIPASS", os.path.abspath("."))
+    return os.path.join(base, path)
+
+def chrome_options(chrome_binary):
+    from selenium.webdriver.chrome.options import Options
+    options = Options()
+    options.binary_location = chrome_binary
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--new-window")
+    return options
+
+def host_of(url):
+    return urlparse(url).hostname or ""
+
+def idle_timeout_from_config(config):
+    try:
+        return float(config.get(IDLE_CONFIG_KEY, DEFAULT_IDLE_TIMEOUT / 60)) * 60
+    except (TypeError, ValueError):
+        return DEFAULT_IDLE_TIMEOUT
+
+class Lease:
+    """A pooled Chrome session on loan to one feature."""
+    def __init__(self, pool, driver=None, launching=None):
+        self.pool = pool
+        self._driver = driver
+        self._launching = launching  # Future of a driver still starting up (prewarm)
+        self.pages = 0
+        self.loans = 0
+        self.authenticated = set()
+        self.broken = False
+        self.reused = False
+        self.preloaded_url = None
+        self.idle_since = time.monotonic()
+
+    @property
+    def driver(self):
+        if self._driver is None and self._launching is not None:
+            self._driver = self._launching.result()  # re-raises if the launch failed
+        return self._driver
+
+    @property
+    def launching(self):
+        return self._driver is None and self._launching is not None and not self._launching.done()
+
+    def get(self, url):
+        self.pages += 1
+        self.driver.get(url)
+
+    def take_preloaded(self, url):
+        """True (once) if a pre-launch already opened url, so it needn't be loaded again."""
+        preloaded, self.preloaded_url = self.preloaded_url, None
+        return preloaded == url and self.driver is not None
+
+    def refresh(self):
+        self.pages += 1
+        self.driver.refresh()
+
+    # `scope` separates sessions on the same host that show different data,
+    # e.g. one attorney calendar per bar number
+    def _auth_key(self, url_or_host, scope):
+        return (host_of(url_or_host) or url_or_host, scope)
+
+    def is_authenticated(self, url_or_host, scope=None):
+        return self._auth_key(url_or_host, scope) in self.authenticated
+
+    def mark_authenticated(self, url_or_host, scope=None):
+        self.authenticated.add(self._auth_key(url_or_host, scope))
+
+    def invalidate(self, url_or_host=None, scope=None):
+        if url_or_host is None:
+            self.authenticated.clear()
+        else:
+            self.authenticated.discard(self._auth_key(url_or_host, scope))
+
+    def release(self, broken=False):
+        self.broken = self.broken or broken
+        self.pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release(broken=exc_type is not None)
+        return False
+
+class BrowserPool:
+    def __init__(self, chrome_binary=None, driver_binary=None, max_drivers=DEFAULT_MAX_DRIVERS,
+                 max_pages=DEFAULT_MAX_PAGES, max_heap_mb=DEFAULT_MAX_HEAP_MB, idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.chrome_binary = chrome_binary or resource_path(os.path.join("chrome-win64", "chrome.exe"))
+        self.driver_binary = driver_binary or resource_path(os.path.join("chromedriver-win64", "chromedriver.exe"))
+        self.max_drivers = max_drivers
+        self.max_pages = max_pages
+        self.max_heap_mb = max_heap_mb
+        self.idle_timeout = idle_timeout
+        self.service = None
+        self.idle = []
+        self.in_use = 0
+        self.lock = threading.Condition()
+        self._service_lock = threading.Lock()
+        self._reaper = None
+        self._wake_reaper = threading.Event()
+        self._closed = False
+
+    # === Service / driver lifecycle ===
+    def _ensure_service(self):
+        with self._service_lock:
+            if self.service is None:
+                from selenium.webdriver.chrome.service import Service
+                print("[INFO] Starting chromedriver service...")
+                self.service = Service(self.driver_binary)
+                self.service.start()
+            return self.service
+
+    def _new_driver(self):
+        from selenium import webdriver
+        # Remote against our own chromedriver: quitting a session leaves the service running
+        service = self._ensure_service()
+        driver = webdriver.Remote(command_executor=service.service_url, options=chrome_options(self.chrome_binary))
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        return driver
+
+    def _is_alive(self, lease):
+        try:
+            lease.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _heap_mb(self, lease):
+        try:
+            used = lease.driver.execute_script(
+                "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0"
+            )
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def _should_recycle(self, lease):
+        if lease.broken or lease.pages >= self.max_pages:
+            return True
+        return self._heap_mb(lease) >= self.max_heap_mb
+
+    def _quit(self, lease):
+        try:
+            lease.driver.quit()
+        except Exception:
+            pass
+
+    # === Lending ===
+    def acquire(self, timeout=None):
+        """Borrow a session; waits if max_drivers are already lent out."""
+        with self.lock:
+            if not self.idle and self.in_use >= self.max_drivers:
+                print("[INFO] Waiting for a browser to be free...")
+            if not self.lock.wait_for(lambda: self.idle or self.in_use < self.max_drivers, timeout):
+                raise TimeoutError("No browser became free in time")
+            lease = self.idle.pop() if self.idle else None
+            self.in_use += 1
+
+        try:
+            if lease is not None and lease.launching:
+                print("[INFO] Waiting for the pre-launched browser to finish starting...")
+            if lease is not None and self._is_alive(lease):
+                lease.loans += 1
+                lease.reused = lease.loans > 1
+                print("♻️ Reusing warm browser session" if lease.reused else "♻️ Using pre-launched browser")
+                return lease
+            if lease is not None:
+                self._quit(lease)
+            lease = Lease(self, self._new_driver())
+            lease.loans = 1
+            return lease
+        except Exception:
+            with self.lock:
+                self.in_use -= 1
+                self.lock.notify()
+            raise
+
+    def release(self, lease):
+        recycle = self._should_recycle(lease)
+        with self.lock:
+            # Don't keep more sessions than max_drivers (e.g. after a batch raised it)
+            recycle = recycle or self.in_use + len(self.idle) > self.max_drivers
+        if recycle:
+            self._quit(lease)
+        with self.lock:
+            self.in_use -= 1
+            if not recycle:
+                lease.idle_since = time.monotonic()
+                self.idle.append(lease)
+                self._start_reaper()
+            self.lock.notify()
+
+    # === Pre-launch / idle shutdown ===
+    def prewarm(self, url=None):
+        """Start a session in the background so the next acquire() doesn't wait for Chrome.
+
+        If url is given it is opened too (see Lease.take_preloaded). Does
+        nothing if a session is already idle (or starting) or none can be lent
+        out. Returns True if a launch was started.
+        """
+        from concurrent.futures import Future
+        with self.lock:
+            if self._closed or self.idle or self.in_use >= self.max_drivers:
+                return False
+            launching = Future()
+            lease = Lease(self, launching=launching)
+            self.idle.append(lease)
+            self._start_reaper()
+
+        def launch():
+            try:
+                driver = self._new_driver()
+            except Exception as e:
+                print(f"[WARNING] Browser pre-launch failed: {e}")
+                launching.set_exception(e)
+                return
+            if url:
+                try:
+                    # Through a Navigator so the preload waits its turn in the host's token bucket
+                    Navigator(driver).get(url, required=False)
+                    lease.pages += 1
+                    lease.preloaded_url = url
+                except Exception:
+                    pass  # the feature will load it itself
+            launching.set_result(driver)
+        threading.Thread(target=launch, daemon=True).start()
+        return True
+
+    def _start_reaper(self):
+        # Called with self.lock held
+        if self.idle_timeout and self._reaper is None:
+            self._reaper = threading.Thread(target=self._reap_idle, daemon=True)
+            self._reaper.start()
+
+    def set_idle_timeout(self, seconds):
+        """Change the idle shutdown delay (0 disables it); applies to sessions already idle."""
+        with self.lock:
+            self.idle_timeout = seconds
+            if self.idle:
+                self._start_reaper()
+        self._wake_reaper.set()
+
+    def _reap_idle(self):
+        while not self._closed:
+            with self.lock:
+                if not self.idle_timeout:
+                    # Disabled; set_idle_timeout() starts a new reaper if it is turned back on
+                    self._reaper = None
+                    return
+                now = time.monotonic()
+                expired = [l for l in self.idle if not l.launching and now - l.idle_since >= self.idle_timeout]
+                self.idle = [l for l in self.idle if l not in expired]
+                next_expiry = min((l.idle_since + self.idle_timeout for l in self.idle), default=now + self.idle_timeout)
+            if expired:
+                print(f"[INFO] Closing {len(expired)} browser session(s) idle for {self.idle_timeout / 60:.0f} min")
+                for lease in expired:
+                    self._quit(lease)
+                with self.lock:
+                    # Under the lock so a concurrent acquire() can't start a session on it meanwhile
+                    if not self.idle and not self.in_use:
+                        self._stop_service()
+            self._wake_reaper.wait(max(next_expiry - time.monotonic(), 1.0))
+            self._wake_reaper.clear()
+
+    def _stop_service(self):
+        with self._service_lock:
+            if self.service is not None:
+                try:
+                    self.service.stop()
+                except Exception:
+                    pass
+                self.service = None
+
+    def shutdown(self):
+        with self.lock:
+            self._closed = True
+            idle, self.idle = self.idle, []
+        self._wake_reaper.set()
+        for lease in idle:
+            self._quit(lease)
+        self._stop_service()
+
+# === Process-wide pool ===
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
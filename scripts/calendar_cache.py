@@ -0,0 +1,57 @@
+# scripts/calendar_cache.py
+#
+# Parsed-calendar snapshots keyed by bar number and court, so "Scrape Cases"
+# and "Generate Waivers" can share one browser run and one parse.
+
+import os
+import re
+import json
+import time
+
+DEFAULT_TTL_MINUTES = 30
+TTL_CONFIG_KEY = "cache.calendar_ttl_minutes"
+
+def cache_dir():
+    return os.path.join(os.environ["LOCALAPPDATA"], "DocketBot", "calendar_cache")
+
+def snapshot_path(bar_number, court):
+    court_slug = re.sub(r'[^A-Z0-9]+', '_', court.strip().upper()).strip('_')
+    return os.path.join(cache_dir(), f"{bar_number}_{court_slug}.json")
+
+def ttl_from_config(config):
+    try:
+        return float(config.get(TTL_CONFIG_KEY, DEFAULT_TTL_MINUTES)) * 60
+    except (TypeError, ValueError):
+        return DEFAULT_TTL_MINUTES * 60
+
+def load_snapshot(bar_number, court, ttl_seconds):
+    """Return the cached case list if it is younger than ttl_seconds, else None."""
+    if ttl_seconds <= 0:
+        return None
+    path = snapshot_path(bar_number, court)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+    age = time.time() - snapshot.get("fetched_at", 0)
+    if age > ttl_seconds:
+        return None
+    print(f"🗂️ Using calendar snapshot from {age / 60:.0f} min ago ({len(snapshot['cases'])} cases)")
+    return snapshot["cases"]
+
+def save_snapshot(bar_number, court, cases):
+    path = snapshot_path(bar_number, court)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    snapshot = {"bar_number": bar_number, "court": court, "fetched_at": time.time(), "cases": cases}
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, indent=2)
+    os.replace(tmp_path, path)
+
+def clear_snapshot(bar_number, court):
+    try:
+        os.remove(snapshot_path(bar_number, court))
+    except FileNotFoundError:
+        pass
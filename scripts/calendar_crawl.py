@@ -0,0 +1,199 @@
+# scripts/calendar_crawl.py
+#
+# Crawl mode for attorney calendars wider than the landing page: walks date
+# windows and "next page" links, and pipelines the work so the browser fetches
+# page N+1 while page N is parsed and page N-1 is written:
+#
+#   fetch_pages -> [queue] -> parse_pages -> [queue] -> write_batches
+#
+# Every stage is a generator; threaded() runs one in its own thread behind a
+# bounded queue, so a slow stage holds the faster ones back (backpressure)
+# instead of piling pages up in memory. Wall time approaches the slowest stage
+# rather than the sum of all three.
+#
+# The court site's date-range query parameters aren't fixed here: set
+# "scraper.calendar_window_url" in config.json to a URL template using
+# {start} / {end} (formatted with "scraper.calendar_date_format"). The crawl
+# refuses to run without it, since the landing page alone is just today's
+# calendar. If a window's results span several pages, also set
+# "scraper.calendar_next_selector" to the CSS selector of the next-page link.
+#
+# Crawled cases are not saved as a calendar snapshot: that snapshot stands for
+# today's calendar, and the waiver generator would print waivers for the whole
+# crawled range from it.
+
+import time
+import queue
+import threading
+from datetime import date, timedelta
+
+from scripts.calendar_parser import iter_calendar_cases, RESULT_SELECTOR, SUNNYSIDE_COURT
+from scripts.navigation import css_present, replaced, configure_from
+from scripts.config_store import get_store
+from scripts import run_metrics
+
+WINDOW_URL_KEY = "scraper.calendar_window_url"
+DATE_FORMAT_KEY = "scraper.calendar_date_format"
+NEXT_SELECTOR_KEY = "scraper.calendar_next_selector"
+DEFAULT_DATE_FORMAT = "%m/%d/%Y"
+DEFAULT_NEXT_SELECTOR = ""  # no paging within a window unless configured
+DEFAULT_WINDOW_DAYS = 7
+MAX_PAGES_PER_WINDOW = 50
+QUEUE_SIZE = 2
+
+# === Pipeline plumbing ===
+_DONE = object()
+
+class _Failed:
+    def __init__(self, exc):
+        self.exc = exc
+
+def threaded(iterable, maxsize=QUEUE_SIZE):
+    """Run `iterable` in a background thread, yielding its items through a bounded queue."""
+    q = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failed(e))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
+
+# === Stages ===
+def date_windows(start, end, days=DEFAULT_WINDOW_DAYS):
+    current = start
+    while current <= end:
+        window_end = min(end, current + timedelta(days=days - 1))
+        yield current, window_end
+        current = window_end + timedelta(days=1)
+
+def window_urls(template, start, end, days=DEFAULT_WINDOW_DAYS, date_format=DEFAULT_DATE_FORMAT):
+    if not template:
+        raise ValueError(f'Set "{WINDOW_URL_KEY}" in config.json to crawl a date range')
+    for window_start, window_end in date_windows(start, end, days):
+        yield template.format(start=window_start.strftime(date_format), end=window_end.strftime(date_format))
+
+def fetch_pages(nav, urls, next_selector=DEFAULT_NEXT_SELECTOR, stats=None, max_pages=MAX_PAGES_PER_WINDOW):
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import TimeoutException
+    stats = stats if stats is not None else {}
+    driver = nav.driver
+    for url in urls:
+        start = time.monotonic()
+        nav.get(url, ready=css_present(RESULT_SELECTOR), timeout=3, required=False)
+        for page in range(1, max_pages + 1):
+            html = driver.page_source
+            stats["fetch"] = stats.get("fetch", 0.0) + time.monotonic() - start
+            stats["pages"] = stats.get("pages", 0) + 1
+            yield f"{url} (page {page})", html
+
+            start = time.monotonic()
+            links = driver.find_elements(By.CSS_SELECTOR, next_selector) if next_selector else []
+            if not links:
+                break
+            # Wait for the current results to be replaced (by a new page or in
+            # place), so the same page isn't read twice
+            old_results = driver.find_elements(By.CSS_SELECTOR, RESULT_SELECTOR)[:1]
+            new_results = css_present(RESULT_SELECTOR)
+            try:
+                nav.click(links[0], ready=replaced(old_results[0], new_results) if old_results else new_results,
+                          timeout=3)
+            except TimeoutException:
+                print(f"⚠️ {url}: next-page link didn't load a new page; skipping the rest of this window.")
+                break
+
+def parse_pages(pages, court=SUNNYSIDE_COURT, stats=None):
+    stats = stats if stats is not None else {}
+    for label, html in pages:
+        start = time.monotonic()
+        page_stats = {}
+        cases = list(iter_calendar_cases(html, court=court, stats=page_stats))
+        stats["parse"] = stats.get("parse", 0.0) + time.monotonic() - start
+        stats["seen"] = stats.get("seen", 0) + page_stats["seen"]
+        print(f"📄 {label}: {page_stats['seen']} results, {len(cases)} for {court}")
+        yield cases
+
+def write_batches(batches, bar_number, destination, stats=None):
+    from scripts import scrape_cases
+    stats = stats if stats is not None else {}
+    for cases in batches:
+        start = time.monotonic()
+        if cases:
+            scrape_cases.process_cases(cases, bar_number, destination)
+        stats["write"] = stats.get("write", 0.0) + time.monotonic() - start
+        yield cases
+
+# === Driver ===
+def crawl(nav, bar_number, destination, start, end, config=None, window_days=DEFAULT_WINDOW_DAYS):
+    config = config or {}
+    urls = list(window_urls(config.get(WINDOW_URL_KEY), start, end, window_days,
+                       config.get(DATE_FORMAT_KEY, DEFAULT_DATE_FORMAT)))
+    stats = {}
+    wall = time.monotonic()
+
+    pages = threaded(fetch_pages(nav, urls, config.get(NEXT_SELECTOR_KEY, DEFAULT_NEXT_SELECTOR), stats))
+    batches = threaded(parse_pages(pages, stats=stats))
+    all_cases = []
+    for cases in write_batches(batches, bar_number, destination, stats):
+        all_cases.extend(cases)
+
+    wall = time.monotonic() - wall
+    # Fetch and parse run on their own threads; record their totals here
+    run_metrics.current().add("page load", stats.get("fetch", 0.0), stats.get("pages", 0))
+    run_metrics.current().add("parse", stats.get("parse", 0.0), stats.get("pages", 0))
+    run_metrics.count("cases found", len(all_cases))
+    print(f"""
+Crawl Summary ({start} to {end}):
+  Pages fetched:   {stats.get('pages', 0)}
+  Results seen:    {stats.get('seen', 0)}
+  Cases kept:      {len(all_cases)}
+  Fetch time:      {stats.get('fetch', 0.0):.1f}s
+  Parse time:      {stats.get('parse', 0.0):.1f}s
+  Write time:      {stats.get('write', 0.0):.1f}s
+  Wall time:       {wall:.1f}s
+""")
+    return all_cases
+
+def run_crawl_main(continue_event=None, days_ahead=30, window_days=DEFAULT_WINDOW_DAYS):
+    from scripts import scrape_cases
+    config = get_store().snapshot()
+    configure_from(config)
+    scraper = scrape_cases.Scraper()
+
+    def browser_then_crawl():
+        broken = True
+        try:
+            with run_metrics.run("crawl", bar_number=scraper.bar_number, days=days_ahead):
+                scraper.open_browser_and_wait(continue_event)
+                start = date.today()
+                crawl(scraper.nav, scraper.bar_number, scraper.destination, start,
+                      start + timedelta(days=days_ahead), config, window_days)
+            broken = False
+        finally:
+            scraper.release(broken=broken)
+
+    threading.Thread(target=browser_then_crawl, daemon=True).start()
@@ -0,0 +1,112 @@
+# scripts/calendar_parser.py
+#
+# Single-pass parser for the dw.courts.wa.gov attorney calendar results page.
+# Result blocks are parsed as lxml emits them and discarded right after, so the
+# whole page never sits in memory as a tree, and the Court field is checked
+# before anything else so results from other courts cost almost nothing.
+#
+# lxml is only imported when a page is first parsed, so modules that just need
+# the URL/court constants don't pay for it at startup.
+
+from io import BytesIO
+from functools import lru_cache
+from types import SimpleNamespace
+
+CALENDAR_URL = "https://dw.courts.wa.gov/index.cfm?fa=home.atty&terms=accept&flashform=0"
+RESULT_CLASS = "dw-cal-search-result"
+RESULT_SELECTOR = f"div.{RESULT_CLASS}"
+SUNNYSIDE_COURT = "SUNNYSIDE MUNICIPAL"
+
+def _has_class(name):
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+# === Compiled XPaths (built once on first use, reused for every result) ===
+# The Court label is matched exactly (colon ignored, as parse_result strips it)
+# so "Courtroom:" is never mistaken for it.
+@lru_cache(maxsize=None)
+def _xpaths():
+    from lxml import etree
+    return SimpleNamespace(
+        etree=etree,
+        court=etree.XPath(
+            f'.//div[{_has_class("dw-cal-result-item")}]'
+            f'[div[{_has_class("dw-cal-result-label")}][normalize-space(translate(., ":", ""))="Court"]]'
+            f'/div[{_has_class("dw-cal-result-data")}]'
+        ),
+        # Last div of the first icon row; later rows (e.g. an officer) aren't the client
+        name=etree.XPath(f'((.//div[{_has_class("dw-icon-row")}])[1]//div)[last()]'),
+        month=etree.XPath(f'.//div[{_has_class("dw-cal-result-month")}]'),
+        day=etree.XPath(f'.//div[{_has_class("dw-cal-result-day")}]'),
+        year=etree.XPath(f'.//div[{_has_class("dw-cal-result-year")}]'),
+        items=etree.XPath(f'.//div[{_has_class("dw-cal-result-item")}]'),
+        label=etree.XPath(f'div[{_has_class("dw-cal-result-label")}]'),
+        data=etree.XPath(f'div[{_has_class("dw-cal-result-data")}]'),
+    )
+
+def _text(elem):
+    return "".join(elem.itertext()).strip()
+
+def _first_text(xpath, elem):
+    found = xpath(elem)
+    return _text(found[0]) if found else None
+
+def normalize_court(court):
+    return (court or "").strip().upper()
+
+def parse_result(elem):
+    xp = _xpaths()
+    result = {}
+    name = _first_text(xp.name, elem)
+    if name is not None:
+        result["Client Name"] = name
+
+    month, day, year = _first_text(xp.month, elem), _first_text(xp.day, elem), _first_text(xp.year, elem)
+    if None in (month, day, year):
+        result["Appointment Date"] = ""
+    else:
+        result["Appointment Date"] = f"{month} {day}, {year}"
+
+    for item in xp.items(elem):
+        label, data = xp.label(item), xp.data(item)
+        if not label or not data:
+            continue
+        label = _text(label[0]).strip(": ")
+        value = _text(data[0])
+        if label == "Case Number":
+            value = value.split(' ')[0]
+        result[label] = value
+
+    result["Court"] = result.get("Court", "")
+    return result
+
+def iter_calendar_cases(html, court=None, stats=None):
+    """Yield one case dict per calendar result, optionally only for `court`.
+
+    `stats`, if given, is a dict that receives the number of results seen
+    before filtering under "seen".
+    """
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    wanted = normalize_court(court) if court else None
+    xp = _xpaths()
+    if stats is not None:
+        stats["seen"] = 0
+
+    for _, elem in xp.etree.iterparse(BytesIO(html), events=("end",), tag="div", html=True, encoding="utf-8"):
+        if RESULT_CLASS not in (elem.get("class") or "").split():
+            continue
+        if stats is not None:
+            stats["seen"] += 1
+
+        if wanted is None or normalize_court(_first_text(xp.court, elem)) == wanted:
+            yield parse_result(elem)
+
+        # Drop the finished result and anything before it
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+def parse_calendar(html, court=None, stats=None):
+    return list(iter_calendar_cases(html, court, stats))
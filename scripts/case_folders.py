@@ -0,0 +1,46 @@
+# scripts/case_folders.py
+#
+# Creates the "{client}; {case_num}" folders for a batch of cases with one
+# directory listing instead of a makedirs call per case, which matters on
+# network shares holding thousands of client folders.
+
+import os
+
+def case_folder_name(case):
+    client = case.get('Client Name', 'Unknown')
+    case_num = case.get('Case Number', 'NoCaseNumber')
+    return f"{client}; {case_num}"
+
+def existing_folders(base_path):
+    # normcase so "Doe, Jane; C1" and "DOE, JANE; C1" are the same folder on Windows
+    try:
+        with os.scandir(base_path) as entries:
+            return {os.path.normcase(e.name) for e in entries if e.is_dir()}
+    except FileNotFoundError:
+        return set()
+
+def reconcile_case_folders(base_path, cases, verbose=False):
+    """Create any missing case folders under base_path.
+
+    Returns {"created": [...], "existing": [...]} with folder names.
+    """
+    os.makedirs(base_path, exist_ok=True)
+    on_disk = existing_folders(base_path)
+
+    created, existing = [], []
+    wanted = dict.fromkeys(case_folder_name(case) for case in cases)
+    for name in wanted:
+        if os.path.normcase(name) in on_disk:
+            existing.append(name)
+            continue
+        try:
+            os.mkdir(os.path.join(base_path, name))
+        except FileExistsError:
+            existing.append(name)
+            continue
+        created.append(name)
+        if verbose:
+            print(f"📁 Created folder: {os.path.join(base_path, name)}")
+
+    print(f"📁 {base_path}: {len(created)} folder(s) created, {len(existing)} already existed")
+    return {"created": created, "existing": existing}
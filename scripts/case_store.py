@@ -0,0 +1,196 @@
+# scripts/case_store.py
+#
+# Indexed store behind {bar}_Cases.csv. Dedupe is a unique index on the
+# normalized (client, case number) pair instead of re-reading the CSV, and the
+# CSV is only ever appended to with rows the store has not exported yet, so
+# hand-entered Date / Case Count columns are left alone. The CSV's mtime and size
+# are remembered, so rows the attorney adds or fixes by hand are imported again
+# on the next run.
+
+import os
+import csv
+import sqlite3
+from datetime import datetime
+
+CSV_ENCODING = 'utf-7'
+CSV_HEADER = ['Client Name', 'Case Number', 'Date', 'Case Count']
+
+def default_store_path():
+    return os.path.join(os.environ["LOCALAPPDATA"], "DocketBot", "cases.sqlite3")
+
+def normalize(s):
+    return ''.join(s.split()).upper()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    bar_number  TEXT NOT NULL,
+    client_key  TEXT NOT NULL,
+    case_key    TEXT NOT NULL,
+    client_name TEXT NOT NULL,
+    case_number TEXT NOT NULL,
+    added_at    TEXT NOT NULL,
+    exported    INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (bar_number, client_key, case_key)
+);
+CREATE INDEX IF NOT EXISTS cases_pending ON cases (bar_number, exported);
+CREATE TABLE IF NOT EXISTS csv_imports (
+    csv_path    TEXT PRIMARY KEY,
+    bar_number  TEXT NOT NULL,
+    rows        INTEGER NOT NULL,
+    imported_at TEXT NOT NULL,
+    mtime_ns    INTEGER NOT NULL DEFAULT 0,
+    size        INTEGER NOT NULL DEFAULT -1
+);
+"""
+
+# Columns added to tables that older stores created without them
+MIGRATIONS = {
+    "csv_imports": [("mtime_ns", "INTEGER NOT NULL DEFAULT 0"), ("size", "INTEGER NOT NULL DEFAULT -1")],
+}
+
+class CaseStore:
+    def __init__(self, path=None):
+        self.path = path or default_store_path()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # isolation_level=None: transactions are opened explicitly with BEGIN IMMEDIATE,
+        # which takes the write lock up front so concurrent writers queue instead of deadlocking
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        for table, columns in MIGRATIONS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in columns:
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _transaction(self):
+        return _Transaction(self.conn)
+
+    # === CSV import ===
+    def _record_csv(self, bar_number, csv_path, rows=None):
+        """Remember the CSV's current mtime and size (and row count, if it was just read)."""
+        stat = os.stat(csv_path)
+        now = datetime.now().isoformat(timespec="seconds")
+        self.conn.execute(
+            "INSERT INTO csv_imports (csv_path, bar_number, rows, imported_at, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (csv_path) DO UPDATE SET mtime_ns = excluded.mtime_ns, size = excluded.size,"
+            " rows = COALESCE(?, rows), imported_at = COALESCE(?, imported_at)",
+            (csv_path, bar_number, rows or 0, now, stat.st_mtime_ns, stat.st_size,
+             rows, now if rows is not None else None),
+        )
+
+    def import_csv(self, bar_number, csv_path):
+        """Import the CSV if it changed since it was last read or written; its rows count as exported.
+
+        Rows already in the store are updated (e.g. a name fixed by hand), so
+        they are neither duplicated nor appended to the CSV again.
+        """
+        csv_path = os.path.abspath(csv_path)
+        if not os.path.isfile(csv_path):
+            return 0
+        stat = os.stat(csv_path)
+        with self._transaction():
+            seen = self.conn.execute(
+                "SELECT mtime_ns, size FROM csv_imports WHERE csv_path = ?", (csv_path,)
+            ).fetchone()
+            if seen == (stat.st_mtime_ns, stat.st_size):
+                return 0
+            now = datetime.now().isoformat(timespec="seconds")
+            with open(csv_path, 'r', newline='', encoding=CSV_ENCODING) as f:
+                reader = csv.reader(f)
+                next(reader, None)
+                rows = [
+                    (bar_number, normalize(row[0]), normalize(row[1]), row[0].strip(), row[1].strip(), now)
+                    for row in reader if len(row) >= 2
+                ]
+            self.conn.executemany(
+                "INSERT INTO cases (bar_number, client_key, case_key, client_name, case_number, added_at, exported)"
+                " VALUES (?, ?, ?, ?, ?, ?, 1)"
+                " ON CONFLICT (bar_number, client_key, case_key) DO UPDATE SET"
+                " client_name = excluded.client_name, case_number = excluded.case_number, exported = 1",
+                rows,
+            )
+            self._record_csv(bar_number, csv_path, len(rows))
+        print(f"📥 Imported {len(rows)} rows from {csv_path}")
+        return len(rows)
+
+    # === Writes ===
+    def add_cases(self, bar_number, cases):
+        """Insert new cases; returns (added, skipped) lists of normalized keys."""
+        added, skipped = [], []
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._transaction():
+            for case in cases:
+                client_name = case.get('Client Name', '').strip()
+                case_num = case.get('Case Number', '').strip()
+                key = (normalize(client_name), normalize(case_num))
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO cases (bar_number, client_key, case_key, client_name, case_number, added_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (bar_number, key[0], key[1], client_name, case_num, now),
+                )
+                (added if cur.rowcount else skipped).append(key)
+        return added, skipped
+
+    def export_csv(self, bar_number, csv_path):
+        """Append not-yet-exported rows to the CSV (or write it fresh if it is missing).
+
+        Returns the number of rows written.
+        """
+        with self._transaction():
+            if not os.path.isfile(csv_path):
+                self.conn.execute("UPDATE cases SET exported = 0 WHERE bar_number = ?", (bar_number,))
+                file_mode = 'w'
+            else:
+                file_mode = 'a'
+            pending = self.conn.execute(
+                "SELECT id, client_name, case_number FROM cases WHERE bar_number = ? AND exported = 0 ORDER BY id",
+                (bar_number,),
+            ).fetchall()
+            with open(csv_path, file_mode, newline='', encoding=CSV_ENCODING) as csvfile:
+                writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
+                if file_mode == 'w':
+                    writer.writerow(CSV_HEADER)
+                writer.writerows([client_name, case_num, "", ""] for _, client_name, case_num in pending)
+            self.conn.executemany("UPDATE cases SET exported = 1 WHERE id = ?", [(row[0],) for row in pending])
+            # Our own append isn't a hand edit; don't re-import because of it
+            self._record_csv(bar_number, os.path.abspath(csv_path))
+        return len(pending)
+
+    # === Reads ===
+    def exported_count(self, bar_number):
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM cases WHERE bar_number = ? AND exported = 1", (bar_number,)
+        ).fetchone()[0]
+
+    def contains(self, bar_number, client_name, case_num):
+        return self.conn.execute(
+            "SELECT 1 FROM cases WHERE bar_number = ? AND client_key = ? AND case_key = ?",
+            (bar_number, normalize(client_name), normalize(case_num)),
+        ).fetchone() is not None
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
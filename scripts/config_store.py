@@ -0,0 +1,173 @@
+# scripts/config_store.py
+#
+# One in-process copy of %LOCALAPPDATA%/DocketBot/config.json. It is read from
+# disk once; every feature reads through get_store() (so a bar number changed in
+# the GUI applies to the next run without a restart), writes go to a temp file
+# that is renamed over config.json, and subscribers are told which keys changed.
+#
+# A config.json that isn't valid JSON (e.g. a hand edit with a trailing comma)
+# is never overwritten behind the user's back: reload() leaves everything as it
+# was, defaults are only filled in memory, and an explicit change made in the
+# GUI copies the unreadable file to config.json.invalid-<time> before writing.
+#
+# Only uses the standard library.
+
+import os
+import json
+import shutil
+import threading
+from datetime import datetime
+
+APP_NAME = "DocketBot"
+
+def config_path():
+    return os.path.join(os.environ["LOCALAPPDATA"], APP_NAME, "config.json")
+
+class ConfigStore:
+    """Dict-like view of config.json (get / [] / in) with write-through updates."""
+
+    def __init__(self, path=None):
+        self.path = path or config_path()
+        self._data = None
+        self._unreadable = False  # config.json exists but isn't valid JSON
+        self._lock = threading.RLock()
+        self._subscribers = []
+
+    # === Reading ===
+    def _loaded(self):
+        # Called with self._lock held
+        if self._data is None:
+            try:
+                self._data = self._read()
+            except ValueError as e:
+                print(f"[WARNING] {e}; using defaults until it is fixed (the file is left as is).")
+                self._data = {}
+                self._unreadable = True
+        return self._data
+
+    def _read(self):
+        """The config on disk ({} if there is none); raises ValueError if it isn't valid JSON."""
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{self.path} is not valid JSON ({e})") from e
+
+    def get(self, key, default=None):
+        with self._lock:
+            return self._loaded().get(key, default)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._loaded()[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._loaded()
+
+    def snapshot(self):
+        """A plain dict copy, for a run that should see one consistent config."""
+        with self._lock:
+            return dict(self._loaded())
+
+    # === Writing ===
+    def _write(self, data):
+        try:
+            self._read()
+        except ValueError:
+            # Keep a hand edit that didn't parse rather than silently replacing it
+            backup = f"{self.path}.invalid-{datetime.now():%Y%m%d_%H%M%S}"
+            shutil.copy2(self.path, backup)
+            print(f"[WARNING] Saved the unreadable config as {backup} before writing a new one.")
+        self._unreadable = False
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _commit(self, data):
+        """Write data if it differs from the current config and notify; returns the changed keys."""
+        with self._lock:
+            current = self._loaded()
+            changed = {key: data.get(key) for key in current.keys() | data.keys() if current.get(key) != data.get(key)}
+            if changed:
+                self._write(data)
+                self._data = data
+            subscribers = list(self._subscribers)
+        if changed:
+            for callback in subscribers:
+                try:
+                    callback(changed)
+                except Exception as e:
+                    print(f"[WARNING] Config change handler failed: {e}")
+        return changed
+
+    def update(self, values=None, **kwargs):
+        """Set several keys in one write."""
+        with self._lock:
+            data = dict(self._loaded())
+            data.update(values or {}, **kwargs)
+            return self._commit(data)
+
+    def set(self, key, value):
+        return self.update({key: value})
+
+    def replace(self, data):
+        """Replace the whole config (e.g. reset to defaults)."""
+        return self._commit(dict(data))
+
+    def ensure_defaults(self, defaults):
+        """Add any missing keys from defaults, writing only if something was missing.
+
+        An unreadable config.json is not overwritten; the defaults then only
+        apply in memory.
+        """
+        with self._lock:
+            data = dict(self._loaded())
+            missing = {key: value for key, value in defaults.items() if key not in data}
+            if missing or not os.path.exists(self.path):
+                data.update(missing)
+                if not self._unreadable:
+                    self._write(data)
+                self._data = data
+        return missing
+
+    def reload(self):
+        """Re-read config.json (after a hand edit) and notify about what changed.
+
+        If the file isn't valid JSON, warns and changes nothing.
+        """
+        with self._lock:
+            try:
+                data = self._read()
+            except ValueError as e:
+                print(f"[WARNING] {e}; keeping the current settings.")
+                return {}
+            # The file is readable again, so it is safe to write over
+            self._unreadable = False
+            return self._commit(data)
+
+    # === Change notification ===
+    def subscribe(self, callback):
+        """Call callback({key: new value}) after every change; returns an unsubscribe function."""
+        with self._lock:
+            self._subscribers.append(callback)
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
+
+# === Process-wide store ===
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ConfigStore()
+        return _store
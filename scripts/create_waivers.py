@@ -1,165 +1,79 @@
 import os
 import sys
-import time
-import random
 import re
 import unicodedata
-import json
-from io import BytesIO
 from datetime import datetime
 from collections import defaultdict
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from PyPDF2 import PdfReader, PdfWriter
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-
-CHROME_PATH = "chrome-win64/chrome.exe"
-CHROMEDRIVER_PATH = "chromedriver-win64/chromedriver.exe"
-MAX_CASE_WIDTH = 220
+
+from scripts.browser_pool import get_pool
+from scripts.calendar_parser import iter_calendar_cases, CALENDAR_URL, RESULT_SELECTOR, SUNNYSIDE_COURT
+from scripts.navigation import Navigator, css_present, configure_from
+from scripts.calendar_cache import load_snapshot, save_snapshot, ttl_from_config
+from scripts.config_store import get_store
+from scripts import run_metrics
 
 def resource_path(path):
     base = getattr(sys, "_MEIPASS", os.path.abspath("."))
     return os.path.join(base, path)
 
-def load_config():
-    path = os.path.join(os.environ["LOCALAPPDATA"], "DocketBot", "config.json")
-    with open(path, "r") as f:
-        return json.load(f)
-
-def hide():
-    time.sleep(random.randint(0, 2) + random.random())
-
 def normalize_for_grouping(name):
     name = unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode()
     name = re.sub(r'\b(jr|sr|ii|iii|iv|v)\b\.?', '', name, flags=re.IGNORECASE)
     return re.sub(r'[^a-z]', '', name.lower())
 
-def create_overlay(name, case_num, year, sig_path=None, bar_number="00000"):
-    packet = BytesIO()
-    can = canvas.Canvas(packet, pagesize=letter)
-
-    # Top fields
-    name_x, name_y = 60, 648
-    cases_x, cases_y = 350, 643
-    year_x, year_y = 356, 394
-
-    # Signature + bar fields
-    # hardcoded below
-
-    can.setFont("Helvetica", 10)
-    can.drawString(name_x, name_y, name)
-    can.drawString(year_x, year_y, year)
-
-    # Wrap case numbers
-    case_nums = case_num.split(", ")
-    current_line = ""
-    lines = []
-    for num in case_nums:
-        test_line = current_line + (", " if current_line else "") + num
-        if can.stringWidth(test_line, "Helvetica", 10) <= MAX_CASE_WIDTH:
-            current_line = test_line
+def run_browser_and_scrape(event=None, pool=None, bar_number="00000"):
+    with run_metrics.phase("browser launch"):
+        lease = (pool or get_pool()).acquire()
+    driver = lease.driver
+    nav = Navigator(lease)
+    try:
+        if lease.is_authenticated(CALENDAR_URL, scope=bar_number):
+            print("♻️ Browser session already past the CAPTCHA, no need to wait.")
+            with run_metrics.phase("page load"):
+                nav.get(CALENDAR_URL)
         else:
-            lines.append(current_line)
-            current_line = num
-    if current_line:
-        lines.append(current_line)
-
-    font_size = 10
-    if len(lines) > 2:
-        font_size = 9 if len(lines) <= 3 else 8
-
-    for i, line in enumerate(lines):
-        y_offset = cases_y - (i * (font_size + 2))
-        can.setFont("Helvetica", font_size)
-        can.drawString(cases_x, y_offset, line)
-
-    # Signature image
-    if sig_path and os.path.exists(sig_path):
-        try:
-            print(f"[DEBUG] Adding signature from: {sig_path}")
-            from reportlab.lib.utils import ImageReader
-            img = ImageReader(sig_path)
-            can.drawImage(img, 120, 230, width=170, height=45, preserveAspectRatio=True, mask='auto')
-        except Exception as e:
-            print(f"[ERROR] Failed to add signature image: {e}")
-    else:
-        print(f"[WARNING] Signature image missing or invalid: {sig_path}")
-
-    # Bar number (directly after "WSBA#")
-    can.setFont("Helvetica", 10)
-    can.drawString(105, 215, bar_number)
-
-
-    can.save()
-    packet.seek(0)
-    return PdfReader(packet).pages[0]
-
-def parse_case(soup: BeautifulSoup):
-    result = {}
-    name_div = soup.find('div', class_="dw-icon-row")
-    if name_div:
-        name = name_div.find_all("div")[-1].text.strip()
-        result["Client Name"] = name
-
-    items = soup.find_all("div", class_="dw-cal-result-item")
-    for item in items:
-        label = item.find("div", class_="dw-cal-result-label").text.strip(": ")
-        data = item.find("div", class_="dw-cal-result-data").text.strip()
-        if label == "Case Number":
-            data = data.split(' ')[0]
-        result[label] = data
-
-    result["Court"] = result.get("Court", "")
-    return result
-
-def run_browser_and_scrape(event=None):
-    print("[INFO] Launching browser before waiting on GUI...")
-    print("🧠 Please complete the CAPTCHA in the browser.")
-    print("⚠️ When ready, click \"Continue (after captcha)\" in the DocketBot GUI.\n")
-    
-    time.sleep(2)
-
-    chrome_options = Options()
-    chrome_options.binary_location = resource_path(CHROME_PATH)
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--new-window")
-
-    driver = webdriver.Chrome(service=Service(resource_path(CHROMEDRIVER_PATH)), options=chrome_options)
-    driver.set_page_load_timeout(10)
-
-    hide()
-    driver.get("https://dw.courts.wa.gov/index.cfm?fa=home.atty&terms=accept&flashform=0")
-    time.sleep(2)
-
-    if event:
-        event.wait()
-
-    driver.refresh()
-    time.sleep(3)
-
-    html = driver.page_source
-    soup = BeautifulSoup(html, "lxml")
-
-    case_soups = soup.find_all("div", class_="dw-search-result std-vertical-med-margin dw-cal-search-result")
-    print(f"Found {len(case_soups)} cases (before filtering)...")
-
-    case_details = []
-    for case_soup in case_soups:
-        parsed = parse_case(case_soup)
-        if parsed.get("Court", "").strip().upper() != "SUNNYSIDE MUNICIPAL":
-            continue
-        case_details.append(parsed)
-
-    print(f"🧾 Filtered to {len(case_details)} Sunnyside cases.")
-    driver.quit()
+            print("[INFO] Launching browser before waiting on GUI...")
+            print("🧠 Please complete the CAPTCHA in the browser.")
+            print("⚠️ When ready, click \"Continue (after captcha)\" in the DocketBot GUI.\n")
+
+            with run_metrics.phase("page load"):
+                if not lease.take_preloaded(CALENDAR_URL):
+                    nav.get(CALENDAR_URL)
+
+            if event:
+                with run_metrics.phase("captcha wait"):
+                    event.wait()
+            lease.mark_authenticated(CALENDAR_URL, scope=bar_number)
+
+        with run_metrics.phase("page load"):
+            nav.refresh(ready=css_present(RESULT_SELECTOR), timeout=3, required=False)
+        print(nav.summary())
+
+        with run_metrics.phase("parse"):
+            html = driver.page_source
+            stats = {}
+            case_details = list(iter_calendar_cases(html, court=SUNNYSIDE_COURT, stats=stats))
+        print(f"Found {stats['seen']} cases (before filtering)...")
+        if stats["seen"]:
+            save_snapshot(bar_number, SUNNYSIDE_COURT, case_details)
+        elif lease.reused:
+            print("⚠️ No results on a reused session; the CAPTCHA will be shown again next run.")
+            lease.invalidate(CALENDAR_URL, scope=bar_number)
+
+        print(f"🧾 Filtered to {len(case_details)} Sunnyside cases.")
+    except Exception:
+        lease.release(broken=True)
+        raise
+    lease.release()
     return case_details
 
 def main(event=None):
-    config = load_config()
+    with run_metrics.run("waivers"):
+        generate_waivers(event)
+
+def generate_waivers(event=None):
+    config = get_store().snapshot()  # one consistent config for the whole run
+    configure_from(config)
     bar_number = config.get("scraper.bar_number", "00000")
     sig_path = config.get("waiver.signature_image_path")
     output_dir = config.get("waiver.waiver_output_dir")
@@ -175,7 +89,11 @@ def main(event=None):
     out_path = os.path.join(output_dir, f"{date_string} {bar_number}.pdf")
     os.makedirs(output_dir, exist_ok=True)
 
-    case_details = run_browser_and_scrape(event)
+    case_details = load_snapshot(bar_number, SUNNYSIDE_COURT, ttl_from_config(config))
+    if case_details is None:
+        case_details = run_browser_and_scrape(event, bar_number=bar_number)
+    else:
+        run_metrics.count("calendar cache hits")
     grouped = {}
 
     for case in case_details:
@@ -186,27 +104,19 @@ def main(event=None):
             grouped[norm_key] = {"name": raw_name, "case_numbers": []}
         grouped[norm_key]["case_numbers"].append(case_num)
 
-    output_writer = PdfWriter()
-    for group in grouped.values():
-        name = group["name"]
-        cases = ", ".join(group["case_numbers"])
-        print(f"[DEBUG] Creating overlay for {name} / Bar #{bar_number}")
-        base_pdf = PdfReader(template_path)
-        page = base_pdf.pages[0]
-
-        # Flatten the form fields (e.g. signature line)
-        if "/Annots" in page:
-            print("[DEBUG] Flattening AcroForm fields on template page...")
-            del page["/Annots"]
-
-        overlay = create_overlay(name, cases, year_string, sig_path=sig_path, bar_number=bar_number)
-        page.merge_page(overlay)
-
-        output_writer.add_page(page)
-
-    with open(out_path, "wb") as f:
-        output_writer.write(f)
-    print(f"\n✅ Waiver PDF generated: {out_path}")
+    clients = {key: (group["name"], ", ".join(group["case_numbers"])) for key, group in grouped.items()}
+
+    client_dir = None
+    if config.get("waiver.per_client_pdfs", False):
+        client_dir = os.path.join(output_dir, f"{date_string} {bar_number}")
+    # PyPDF2/reportlab load here rather than at import, after any browser/CAPTCHA step
+    from scripts.waiver_manifest import update_waivers
+    with run_metrics.phase("pdf render"):
+        paths = update_waivers(clients, out_path, template_path, year_string, sig_path=sig_path, bar_number=bar_number,
+                               workers=config.get("waiver.render_workers") or None, client_dir=client_dir,
+                               clients_per_volume=config.get("waiver.clients_per_volume") or None)
+    for path in paths:
+        print(f"\n✅ Waiver PDF generated: {path}")
 
 if __name__ == "__main__":
     main()
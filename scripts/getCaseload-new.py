@@ -7,6 +7,8 @@ import csv
 from pathlib import Path
 import sys
 
+from case_folders import reconcile_case_folders
+
 # --- CONFIG ---
 NIX_OS = False
 CHROME_DRIVER_PATH = "C:/Users/stace/Documents/Python Scripts/chromedriver.exe"
@@ -196,42 +198,24 @@ ensureFolder('Clients Doug McKinley', SHARED_ROOT)
 
 if stacey:
     attorney_root = os.path.join(BASE_PATH, "Stacey")
-    ensureFolder("Stacey", BASE_PATH)
-    for case in caseDetails:
-        client = case.get('Client Name', 'Unknown')
-        case_num = case.get('Case Number', 'NoCaseNumber')
-        case_folder = f"{client}; {case_num}"
-        ensureFolder(case_folder, attorney_root)
+    reconcile_case_folders(attorney_root, caseDetails, verbose=True)
 
     write_cases_to_csv('Stacey', caseDetails)
 
     shared_attorney_root = os.path.join(SHARED_ROOT, "Clients Stacey McKinley")
-    for case in caseDetails:
-        client = case.get('Client Name', 'Unknown')
-        case_num = case.get('Case Number', 'NoCaseNumber')
-        case_folder = f"{client}; {case_num}"
-        ensureFolder(case_folder, shared_attorney_root)
+    reconcile_case_folders(shared_attorney_root, caseDetails, verbose=True)
 
     input('Done! Press enter to close the robot.')
     driver.quit()
 
 elif doug:
     attorney_root = os.path.join(BASE_PATH, "Doug")
-    ensureFolder("Doug", BASE_PATH)
-    for case in caseDetails:
-        client = case.get('Client Name', 'Unknown')
-        case_num = case.get('Case Number', 'NoCaseNumber')
-        case_folder = f"{client}; {case_num}"
-        ensureFolder(case_folder, attorney_root)
+    reconcile_case_folders(attorney_root, caseDetails, verbose=True)
 
     write_cases_to_csv('Doug', caseDetails)
 
     shared_attorney_root = os.path.join(SHARED_ROOT, "Clients Doug McKinley")
-    for case in caseDetails:
-        client = case.get('Client Name', 'Unknown')
-        case_num = case.get('Case Number', 'NoCaseNumber')
-        case_folder = f"{client}; {case_num}"
-        ensureFolder(case_folder, shared_attorney_root)
+    reconcile_case_folders(shared_attorney_root, caseDetails, verbose=True)
 
     input('Done! Press enter to close the robot.')
     driver.quit()
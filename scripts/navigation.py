@@ -0,0 +1,160 @@
+# scripts/navigation.py
+#
+# Page navigation that waits on real readiness conditions instead of fixed
+# sleeps, throttled by a per-host token bucket so we stay polite to the WA
+# agency sites. Each Navigator keeps track of how long it spent rate-limited,
+# loading, and waiting for content, and summary() reports it.
+#
+# Only depends on the standard library and selenium (imported lazily), so the
+# FavoriteButton scripts can import it too.
+
+import time
+import threading
+from urllib.parse import urlparse
+
+# Sustained requests per second and burst size for each host
+DEFAULT_RATES = {
+    "dw.courts.wa.gov": (0.5, 2),
+    "secure.lni.wa.gov": (1.0, 3),
+    "ccfs.sos.wa.gov": (1.0, 3),
+    "secure.dor.wa.gov": (1.0, 3),
+}
+FALLBACK_RATE = (1.0, 3)
+RATE_CONFIG_KEY = "navigation.rate_limits"
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, sleeping until one is available. Returns seconds slept."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+_buckets = {}
+_rates = dict(DEFAULT_RATES)
+_buckets_lock = threading.Lock()
+
+def configure_rate(host, rate, burst=1):
+    with _buckets_lock:
+        _rates[host] = (rate, burst)
+        _buckets.pop(host, None)
+
+def configure_from(config):
+    # config.json may carry {"navigation.rate_limits": {"dw.courts.wa.gov": [0.5, 2], ...}}
+    for host, (rate, burst) in (config.get(RATE_CONFIG_KEY) or {}).items():
+        configure_rate(host, rate, burst)
+
+def bucket_for(url):
+    host = urlparse(url).hostname or ""
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(*_rates.get(host, FALLBACK_RATE))
+        return _buckets[host]
+
+# === Readiness conditions (callables taking a driver) ===
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+def css_present(selector):
+    def condition(driver):
+        from selenium.webdriver.common.by import By
+        return document_ready(driver) and bool(driver.find_elements(By.CSS_SELECTOR, selector))
+    return condition
+
+def id_present(element_id):
+    def condition(driver):
+        from selenium.webdriver.common.by import By
+        return document_ready(driver) and bool(driver.find_elements(By.ID, element_id))
+    return condition
+
+def stale(element):
+    # True once element is gone, i.e. the page it was on has been replaced
+    def condition(driver):
+        from selenium.common.exceptions import StaleElementReferenceException
+        try:
+            element.is_enabled()
+            return False
+        except StaleElementReferenceException:
+            return True
+    return condition
+
+def replaced(element, ready=document_ready):
+    # element (captured before an action) is gone and ready holds for what replaced it
+    is_stale = stale(element)
+    def condition(driver):
+        return is_stale(driver) and ready(driver)
+    return condition
+
+class Navigator:
+    """Wraps a WebDriver (or a browser_pool Lease, so page loads are counted)."""
+    def __init__(self, target, timeout=10):
+        self.target = target
+        self.driver = getattr(target, "driver", target)
+        self.timeout = timeout
+        self.stats = {"pages": 0, "throttled": 0.0, "loading": 0.0, "waiting": 0.0}
+
+    def wait_for(self, condition, timeout=None, required=True):
+        """Wait until condition(driver) is truthy. If not required, give up quietly at the timeout."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        start = time.monotonic()
+        try:
+            WebDriverWait(self.driver, self.timeout if timeout is None else timeout, poll_frequency=0.2).until(condition)
+            return True
+        except TimeoutException:
+            if required:
+                raise
+            return False
+        finally:
+            self.stats["waiting"] += time.monotonic() - start
+
+    def throttle(self, url):
+        # For page loads we trigger ourselves (e.g. clicking a result link)
+        self.stats["throttled"] += bucket_for(url).acquire()
+
+    def _load(self, url, action, ready, timeout, required):
+        self.throttle(url)
+        start = time.monotonic()
+        action()
+        self.stats["loading"] += time.monotonic() - start
+        self.stats["pages"] += 1
+        return self.wait_for(ready or document_ready, timeout, required)
+
+    def get(self, url, ready=None, timeout=None, required=True):
+        return self._load(url, lambda: self.target.get(url), ready, timeout, required)
+
+    def refresh(self, ready=None, timeout=None, required=True):
+        url = self.driver.current_url
+        return self._load(url, self.target.refresh, ready, timeout, required)
+
+    def click(self, element, ready=None, timeout=None, required=True):
+        """Click element and wait for what it loads.
+
+        Without `ready`, waits for the page to be replaced (element goes stale).
+        With it, waits for ready to hold after the click, on a new page or on this
+        one updated in place. Pass a ready condition the old page doesn't meet.
+        """
+        url = self.driver.current_url
+        if ready is None:
+            return self._load(url, element.click, stale(element), timeout, required)
+        return self._load(url, element.click, ready, timeout, required)
+
+    def summary(self):
+        s = self.stats
+        return (f"⏱️ {s['pages']} page(s): {s['loading']:.1f}s loading, "
+                f"{s['waiting']:.1f}s waiting for content, {s['throttled']:.1f}s rate-limited")
@@ -0,0 +1,179 @@
+# scripts/run_metrics.py
+#
+# Per-phase timers and counters for scrape, waiver and intake runs. A run is
+# started with `with run_metrics.run("scrape"):` on the thread doing the work;
+# code anywhere below it records into it with `with phase("parse"):`,
+# `@timed("csv write")` or `count("cases added", n)`, and is a no-op when no
+# run is active. When the run ends, a summary (compared against the usual time
+# of recent runs of the same kind) is printed to the GUI log and the report is
+# appended to run_reports.json next to config.json.
+#
+# Only uses the standard library, so the FavoriteButton scripts can import it.
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from functools import wraps
+from contextlib import contextmanager
+
+REPORT_HISTORY = 200
+SLOW_FACTOR = 1.5  # flag phases this much slower than the median of recent runs
+
+def reports_path():
+    return os.path.join(os.environ["LOCALAPPDATA"], "DocketBot", "run_reports.json")
+
+class RunMetrics:
+    """Phase durations and counters for one run; safe to record into from several threads."""
+
+    def __init__(self, kind, **info):
+        self.kind = kind
+        self.info = info
+        self.started = datetime.now()
+        self.start = time.monotonic()
+        self.seconds = None
+        self.status = "running"
+        self.phases = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, seconds, calls=1):
+        with self._lock:
+            entry = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += seconds
+            entry["calls"] += calls
+
+    @contextmanager
+    def phase(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, time.monotonic() - start)
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def finish(self, status="ok"):
+        self.seconds = time.monotonic() - self.start
+        self.status = status
+
+    def to_dict(self):
+        return {
+            "kind": self.kind,
+            "started": self.started.isoformat(timespec="seconds"),
+            "seconds": round(self.seconds if self.seconds is not None else time.monotonic() - self.start, 3),
+            "status": self.status,
+            "info": self.info,
+            "phases": {name: {"seconds": round(p["seconds"], 3), "calls": p["calls"]} for name, p in self.phases.items()},
+            "counters": dict(self.counters),
+        }
+
+    def summary(self, history=()):
+        """Text summary; phases well above their median in history are flagged."""
+        import statistics
+        previous = [r for r in history if r.get("kind") == self.kind and r.get("status") == "ok"]
+        lines = [f"\nRun Summary ({self.kind}, {self.status}): {self.seconds:.1f}s total"]
+        for name, p in sorted(self.phases.items(), key=lambda item: -item[1]["seconds"]):
+            line = f"  {name + ':':<18}{p['seconds']:>7.1f}s"
+            if p["calls"] > 1:
+                line += f"  ({p['calls']} calls)"
+            usual = [r["phases"][name]["seconds"] for r in previous if name in r.get("phases", {})]
+            if usual:
+                median = statistics.median(usual)
+                line += f"  usual {median:.1f}s"
+                if p["seconds"] > SLOW_FACTOR * median + 0.5:
+                    line += "  ⚠️ slower than usual"
+            lines.append(line)
+        for name, n in sorted(self.counters.items()):
+            lines.append(f"  {name + ':':<18}{n:>7}")
+        return "\n".join(lines) + "\n"
+
+class _NoRun:
+    """Stand-in when no run is active, so instrumented code needs no checks."""
+
+    def add(self, name, seconds, calls=1):
+        pass
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def count(self, name, n=1):
+        pass
+
+_NO_RUN = _NoRun()
+_local = threading.local()
+
+def current():
+    return getattr(_local, "run", None) or _NO_RUN
+
+def phase(name):
+    return current().phase(name)
+
+def count(name, n=1):
+    current().count(name, n)
+
+def timed(name):
+    """Decorator: time every call of the function as phase `name` of the active run."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with current().phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def bind(fn, metrics=None):
+    """Wrap fn so it records into this thread's run (or metrics) from another thread."""
+    metrics = metrics or getattr(_local, "run", None)
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, "run", None)
+        _local.run = metrics
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _local.run = previous
+    return wrapper
+
+def load_reports(path=None):
+    try:
+        with open(path or reports_path(), "r", encoding="utf-8") as f:
+            return json.load(f).get("runs", [])
+    except (KeyError, FileNotFoundError, json.JSONDecodeError):
+        return []
+
+def save_report(metrics, path=None):
+    """Append metrics to the report history (keeping the last REPORT_HISTORY runs); returns the earlier runs."""
+    path = path or reports_path()
+    history = load_reports(path)
+    runs = (history + [metrics.to_dict()])[-REPORT_HISTORY:]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"runs": runs}, f, indent=2)
+    os.replace(tmp_path, path)
+    return history
+
+@contextmanager
+def run(kind, path=None, **info):
+    """Make a new RunMetrics the active run on this thread; report and summarize it on exit."""
+    metrics = RunMetrics(kind, **info)
+    previous = getattr(_local, "run", None)
+    _local.run = metrics
+    status = "error"
+    try:
+        yield metrics
+        status = "ok"
+    finally:
+        _local.run = previous
+        metrics.finish(status)
+        try:
+            history = save_report(metrics, path)
+        except (KeyError, OSError) as e:
+            print(f"[WARNING] Could not save run report: {e}")
+            history = []
+        print(metrics.summary(history))
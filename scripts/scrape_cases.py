@@ -1,186 +1,162 @@
 # scripts/scrape_cases.py
 
 import os
-import csv
-import sys
-import time
-import random
-import json
 import threading
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 
-# === Config ===
-def resource_path(path):
-    base = getattr(sys, "_MEIPASS", os.path.abspath("."))
-    return os.path.join(base, path)
+from scripts.browser_pool import get_pool
+from scripts.calendar_parser import iter_calendar_cases, CALENDAR_URL, RESULT_SELECTOR, SUNNYSIDE_COURT
+from scripts.navigation import Navigator, css_present, configure_from
+from scripts.calendar_cache import load_snapshot, save_snapshot, ttl_from_config
+from scripts.case_store import CaseStore
+from scripts.case_folders import reconcile_case_folders
+from scripts.config_store import get_store
+from scripts import run_metrics
 
-def load_config():
-    config_path = os.path.join(os.environ["LOCALAPPDATA"], "DocketBot", "config.json")
-    with open(config_path, "r") as f:
-        return json.load(f)
+# === Config ===
+# Read from the shared store at call time, so a bar number or folder changed in
+# the GUI applies to the next run without a restart
+def bar_number_setting():
+    return get_store().get("scraper.bar_number", "00000")
 
-config = load_config()
-BAR_NUMBER = config.get("scraper.bar_number", "00000")
-DESTINATION_FOLDER = config.get("scraper.destination_folder", os.path.expanduser("~/Desktop/00000 Misdemeanor Clients"))
+def destination_setting():
+    return get_store().get("scraper.destination_folder", os.path.expanduser("~/Desktop/00000 Misdemeanor Clients"))
 
 # === Utility Functions ===
-def hide():
-    time.sleep(random.randint(0, 2) + random.random())
-
 def ensureFolder(path):
     os.makedirs(path, exist_ok=True)
     print(f"📁 Ensured folder: {path}")
 
-def normalize(s):
-    return ''.join(s.split()).upper()
-
-def parseCase(soup: BeautifulSoup):
-    result = {}
-    name_div = soup.find('div', class_="dw-icon-row")
-    if name_div:
-        name = name_div.find_all("div")[-1].text.strip()
-        result["Client Name"] = name
-
-    try:
-        month = soup.find("div", class_="dw-cal-result-month").text.strip()
-        day = soup.find("div", class_="dw-cal-result-day").text.strip()
-        year = soup.find("div", class_="dw-cal-result-year").text.strip()
-        result["Appointment Date"] = f"{month} {day}, {year}"
-    except Exception:
-        result["Appointment Date"] = ""
-
-    items = soup.find_all("div", class_="dw-cal-result-item")
-    for item in items:
-        label = item.find("div", class_="dw-cal-result-label").text.strip(": ")
-        data = item.find("div", class_="dw-cal-result-data").text.strip()
-        if label == "Case Number":
-            data = data.split(' ')[0]
-        result[label] = data
-
-    return result
-
-def count_csv_rows(filepath):
-    with open(filepath, 'r', newline='', encoding='utf-7') as file:
-        reader = csv.reader(file)
-        return sum(1 for _ in reader)
-
-def write_cases_to_csv(bar_number, cases):
-    ensureFolder(DESTINATION_FOLDER)
-    csv_path = os.path.join(DESTINATION_FOLDER, f'{bar_number}_Cases.csv')
-
-    seen = set()
-    added = skipped = 0
-    initial_length = 0
-    if os.path.isfile(csv_path):
-        initial_length = count_csv_rows(csv_path)
-        with open(csv_path, 'r', newline='', encoding='utf-7') as f:
-            reader = csv.reader(f)
-            next(reader, None)
-            for row in reader:
-                if len(row) >= 2:
-                    seen.add((normalize(row[0]), normalize(row[1])))
-    else:
-        print(f"{csv_path} doesn't exist, creating new file")
-
-    file_mode = 'a' if os.path.isfile(csv_path) else 'w'
-    with open(csv_path, file_mode, newline='', encoding='utf-7') as csvfile:
-        writer = csv.writer(csvfile, quoting=csv.QUOTE_MINIMAL)
-        if file_mode == 'w':
-            writer.writerow(['Client Name', 'Case Number', 'Date', 'Case Count'])
-
-        for case in cases:
-            client_name = case.get('Client Name', '').strip()
-            case_num = case.get('Case Number', '').strip()
-            key = (normalize(client_name), normalize(case_num))
-
-            if key not in seen:
-                writer.writerow([client_name, case_num, "", ""])
-                seen.add(key)
-                added += 1
-                print(f"✅ Added: {key}")
-            else:
-                skipped += 1
-                print(f"⏩ Skipped duplicate: {key}")
-
-    final_length = count_csv_rows(csv_path)
+@run_metrics.timed("csv write")
+def write_cases_to_csv(bar_number, cases, store_path=None, destination=None):
+    destination = destination or destination_setting()
+    ensureFolder(destination)
+    csv_path = os.path.join(destination, f'{bar_number}_Cases.csv')
+
+    with CaseStore(store_path) as store:
+        # First run against an existing CSV: bulk-load it so its rows dedupe
+        store.import_csv(bar_number, csv_path)
+        if not os.path.isfile(csv_path):
+            print(f"{csv_path} doesn't exist, creating new file")
+        initial_length = store.exported_count(bar_number) + 1 if os.path.isfile(csv_path) else 0
+
+        added, skipped = store.add_cases(bar_number, cases)
+        run_metrics.count("cases added", len(added))
+        run_metrics.count("duplicates skipped", len(skipped))
+        for key in added:
+            print(f"✅ Added: {key}")
+        for key in skipped:
+            print(f"⏩ Skipped duplicate: {key}")
+
+        store.export_csv(bar_number, csv_path)
+        final_length = store.exported_count(bar_number) + 1
+
     print(f"""
 CSV Write Summary:
   Initial length:     {initial_length}
   Final length:       {final_length}
-  Cases added:        {added}
-  Duplicates skipped: {skipped}
+  Cases added:        {len(added)}
+  Duplicates skipped: {len(skipped)}
 """)
 
 class Scraper:
-    def __init__(self):
-        self.chrome_binary = resource_path(os.path.join("chrome-win64", "chrome.exe"))
-        self.driver_binary = resource_path(os.path.join("chromedriver-win64", "chromedriver.exe"))
+    def __init__(self, pool=None, bar_number=None, destination=None):
+        self.pool = pool or get_pool()
+        self.bar_number = bar_number or bar_number_setting()
+        self.destination = destination or destination_setting()
+        self.lease = None
         self.driver = None
+        self.nav = None
 
     def open_browser_and_wait(self, continue_event=None):
+        with run_metrics.phase("browser launch"):
+            self.lease = self.pool.acquire()
+        self.driver = self.lease.driver
+        self.nav = Navigator(self.lease)
+
+        if self.lease.is_authenticated(CALENDAR_URL, scope=self.bar_number):
+            print("♻️ Browser session already past the CAPTCHA, no need to wait.")
+            with run_metrics.phase("page load"):
+                self.nav.get(CALENDAR_URL)
+            return
+
         print("[INFO] Launching browser before waiting on GUI...")
         print("🧠 Please complete the CAPTCHA in the browser.")
         print("⚠️ When ready, click \"Continue (after captcha)\" in the DocketBot GUI.\n")
 
-        time.sleep(2)  # Let user read first
-
-        chrome_options = Options()
-        chrome_options.binary_location = self.chrome_binary
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--new-window")
-
-        service = Service(self.driver_binary)
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-
-        self.driver.set_page_load_timeout(10)
-        self.driver.get("https://dw.courts.wa.gov/index.cfm?fa=home.atty&terms=accept&flashform=0")
-        time.sleep(2)
+        with run_metrics.phase("page load"):
+            if not self.lease.take_preloaded(CALENDAR_URL):
+                self.nav.get(CALENDAR_URL)
 
         if continue_event:
-            continue_event.wait()
-
-    def scrape_cases(self):
-        hide()
-        self.driver.refresh()
-        time.sleep(2)
-
-        html = self.driver.page_source
-        soup = BeautifulSoup(html, "lxml")
-        caseSoups = soup.find_all("div", class_="dw-search-result std-vertical-med-margin dw-cal-search-result")
-        print(f'Found {len(caseSoups)} cases (before filtering)')
-
-        caseDetails = []
-        for case_soup in caseSoups:
-            details = parseCase(case_soup)
-            if details.get("Court") != "SUNNYSIDE MUNICIPAL":
-                continue
-            caseDetails.append(details)
-
-        print(f'Filtered to {len(caseDetails)} Sunnyside cases.')
-
-        ensureFolder(DESTINATION_FOLDER)
-
-        for case in caseDetails:
-            client = case.get('Client Name', 'Unknown')
-            case_num = case.get('Case Number', 'NoCaseNumber')
-            case_folder = f"{client}; {case_num}"
-            case_folder_path = os.path.join(DESTINATION_FOLDER, case_folder)
-            ensureFolder(case_folder_path)
-
-        write_cases_to_csv(BAR_NUMBER, caseDetails)
-        self.driver.quit()
-        print("✅ Done!")
-
-def run_main(continue_event=None):
+            with run_metrics.phase("captcha wait"):
+                continue_event.wait()
+        self.lease.mark_authenticated(CALENDAR_URL, scope=self.bar_number)
+
+    def scrape_cases(self, process=True):
+        try:
+            # Results render after load; give them a few seconds but don't fail on an empty calendar
+            with run_metrics.phase("page load"):
+                self.nav.refresh(ready=css_present(RESULT_SELECTOR), timeout=3, required=False)
+            print(self.nav.summary())
+
+            with run_metrics.phase("parse"):
+                html = self.driver.page_source
+                stats = {}
+                caseDetails = list(iter_calendar_cases(html, court=SUNNYSIDE_COURT, stats=stats))
+            run_metrics.count("cases found", len(caseDetails))
+            print(f'Found {stats["seen"]} cases (before filtering)')
+            if stats["seen"]:
+                save_snapshot(self.bar_number, SUNNYSIDE_COURT, caseDetails)
+            elif self.lease.reused:
+                # Reused session may have been logged out; ask for the CAPTCHA next time
+                print("⚠️ No results on a reused session; the CAPTCHA will be shown again next run.")
+                self.lease.invalidate(CALENDAR_URL, scope=self.bar_number)
+
+            print(f'Filtered to {len(caseDetails)} Sunnyside cases.')
+        except BaseException:
+            # Don't hand a session that just failed to the next run
+            self.release(broken=True)
+            raise
+        self.release()
+        if process:
+            process_cases(caseDetails, self.bar_number, self.destination)
+        return caseDetails
+
+    def release(self, broken=False):
+        if self.lease is not None:
+            self.lease.release(broken=broken)
+            self.lease = self.driver = None
+
+def process_cases(cases, bar_number=None, destination=None):
+    bar_number = bar_number or bar_number_setting()
+    destination = destination or destination_setting()
+    with run_metrics.phase("folders"):
+        reconcile_case_folders(destination, cases, verbose=True)
+    write_cases_to_csv(bar_number, cases, destination=destination)
+    print("✅ Done!")
+
+def run_main(continue_event=None, force_refresh=False, on_cached=None):
+    """Scrape on a background thread. force_refresh skips the calendar snapshot;
+    on_cached() is called (from that thread) if the snapshot was used and no browser opened."""
+    config = get_store()
+    configure_from(config)
     scraper = Scraper()
 
     def browser_then_scrape():
-        scraper.open_browser_and_wait(continue_event)
-        scraper.scrape_cases()
+        with run_metrics.run("scrape", bar_number=scraper.bar_number, force_refresh=force_refresh):
+            cached = None if force_refresh else load_snapshot(scraper.bar_number, SUNNYSIDE_COURT, ttl_from_config(config))
+            if cached is not None:
+                run_metrics.count("calendar cache hits")
+                process_cases(cached, scraper.bar_number, scraper.destination)
+                if on_cached:
+                    on_cached()
+                return
+            try:
+                scraper.open_browser_and_wait(continue_event)
+            except Exception:
+                scraper.release(broken=True)
+                raise
+            scraper.scrape_cases()
 
     threading.Thread(target=browser_then_scrape, daemon=True).start()
 
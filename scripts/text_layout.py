@@ -0,0 +1,93 @@
+# scripts/text_layout.py
+#
+# Small text layout helpers shared by the waiver renderer and the
+# FavoriteButton New Matter Form: measure with cached glyph widths, break lines
+# in one pass, shrink the font until text fits, and split lines into pages.
+#
+# Only depends on reportlab, so the FavoriteButton scripts can import it too.
+
+from functools import lru_cache
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+class FontMetrics:
+    """Glyph widths for one font at one size, measured once per character."""
+
+    def __init__(self, font_name, size):
+        self.font_name = font_name
+        self.size = size
+        self._widths = {}
+
+    def char_width(self, ch):
+        width = self._widths.get(ch)
+        if width is None:
+            width = self._widths[ch] = stringWidth(ch, self.font_name, self.size)
+        return width
+
+    def width(self, text):
+        return sum(self.char_width(ch) for ch in text)
+
+@lru_cache(maxsize=None)
+def metrics(font_name="Helvetica", size=10):
+    return FontMetrics(font_name, size)
+
+def _split_long(token, max_width, fm):
+    """Hard-break a token that is wider than a whole line."""
+    pieces, current, current_width = [], "", 0.0
+    for ch in token:
+        ch_width = fm.char_width(ch)
+        if current and current_width + ch_width > max_width:
+            pieces.append(current)
+            current, current_width = "", 0.0
+        current += ch
+        current_width += ch_width
+    if current:
+        pieces.append(current)
+    return pieces
+
+def wrap(text, max_width, font_name="Helvetica", size=10, separator=" ", indent=""):
+    """Greedy line breaking on separator, measuring each token once.
+
+    Continuation lines start with indent; tokens too wide for a line are split.
+    """
+    fm = metrics(font_name, size)
+    sep_width = fm.width(separator)
+    indent_width = fm.width(indent)
+
+    lines = []
+    current, current_width = [], 0.0
+    for token in text.split(separator):
+        token_width = fm.width(token)
+        line_start = indent_width if lines else 0.0
+        if current and current_width + sep_width + token_width <= max_width:
+            current.append(token)
+            current_width += sep_width + token_width
+            continue
+        if current:
+            lines.append(separator.join(current))
+            current, current_width = [], 0.0
+            line_start = indent_width
+        if line_start + token_width > max_width:
+            *full, token = _split_long(token, max_width - indent_width, fm)
+            lines.extend(full)
+            token_width = fm.width(token)
+            if full:
+                line_start = indent_width
+        current, current_width = [token], line_start + token_width
+    if current:
+        lines.append(separator.join(current))
+    return [indent + line if i else line for i, line in enumerate(lines)]
+
+def fit(text, max_width, limits, font_name="Helvetica", separator=" "):
+    """Wrap at the first (size, max_lines) in limits that fits; returns (size, lines).
+
+    max_lines=None accepts any line count. If nothing fits, the last size is used.
+    """
+    for size, max_lines in limits:
+        lines = wrap(text, max_width, font_name, size, separator)
+        if max_lines is None or len(lines) <= max_lines:
+            return size, lines
+    return size, lines
+
+def paginate(lines, lines_per_page):
+    """Split lines into pages of at most lines_per_page."""
+    return [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
@@ -0,0 +1,116 @@
+# scripts/waiver_manifest.py
+#
+# Remembers which clients are already in each day's waiver PDF so re-runs only
+# render new or changed clients. The manifest lives in waiver.waiver_output_dir
+# and maps output file name -> the files written (one, or "part N" volumes)
+# and normalized client key -> {hash, page}.
+
+import os
+import json
+import hashlib
+from PyPDF2 import PdfReader
+
+from scripts.waiver_renderer import WaiverRenderer, iter_overlays
+from scripts.waiver_stream import WaiverVolumes
+from scripts import run_metrics
+
+MANIFEST_NAME = "waiver_manifest.json"
+
+def manifest_path(output_dir):
+    return os.path.join(output_dir, MANIFEST_NAME)
+
+def client_hash(name, case_numbers, year, bar_number):
+    payload = json.dumps([name, case_numbers, year, bar_number], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def load_manifest(output_dir):
+    try:
+        with open(manifest_path(output_dir), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    entries = {}
+    for name, entry in manifest.items():
+        if "clients" not in entry:
+            entry = {"files": [name], "clients_per_volume": None, "clients": entry}  # from before volumes
+        # Forget outputs that were deleted or moved out of the folder
+        if all(os.path.isfile(os.path.join(output_dir, f)) for f in entry["files"]):
+            entries[name] = entry
+    return entries
+
+def save_manifest(output_dir, manifest):
+    path = manifest_path(output_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+def read_overlays(output_dir, files):
+    """Client overlays of every page in files, in order; None if any page isn't a stamped waiver."""
+    overlays = []
+    for name in files:
+        for page in PdfReader(os.path.join(output_dir, name)).pages:
+            overlay_data = WaiverRenderer.extract_overlay(page)
+            if overlay_data is None:
+                return None
+            overlays.append(overlay_data)
+    return overlays
+
+def update_waivers(clients, out_path, template_path, year, sig_path=None, bar_number="00000",
+                   workers=None, client_dir=None, clients_per_volume=None):
+    """Bring out_path up to date with clients ({key: (name, case_numbers)}); returns the paths written."""
+    output_dir, out_name = os.path.split(out_path)
+    manifest = load_manifest(output_dir)
+    previous = manifest.get(out_name, {})
+    old_files = previous.get("files", [])
+    entries = previous.get("clients", {})
+    existing = read_overlays(output_dir, old_files) if entries else []
+    if existing is None or len(existing) != len(entries):
+        print(f"[WARNING] {out_name} doesn't match the waiver manifest, rebuilding it.")
+        existing, entries = [], {}
+
+    hashes = {key: client_hash(name, cases, year, bar_number) for key, (name, cases) in clients.items()}
+    stale = {key for key in clients if entries.get(key, {}).get("hash") != hashes[key]}
+    if not stale and previous.get("clients_per_volume") == clients_per_volume:
+        print(f"♻️ {out_name} is up to date ({len(entries)} waivers).")
+        return [os.path.join(output_dir, name) for name in old_files]
+
+    # Pages already in the file keep their place (even clients no longer on
+    # the calendar); changed clients are replaced in place, new ones appended.
+    # Only client overlays are carried over, so each file keeps one template,
+    # and pages are streamed to disk as they are ready.
+    order = sorted(entries, key=lambda key: entries[key]["page"])
+    order += [key for key in clients if key in stale and key not in entries]
+    to_render = [key for key in order if key in stale]
+    for key in to_render:
+        print(f"[DEBUG] Creating overlay for {clients[key][0]} / Bar #{bar_number}")
+
+    renderer = WaiverRenderer(template_path, year, sig_path=sig_path, bar_number=bar_number)
+    rendered = iter_overlays([clients[key] for key in to_render], template_path, year, sig_path, bar_number,
+                             workers, client_dir, renderer)
+    new_entries = {}
+    with WaiverVolumes(out_path, renderer, clients_per_volume) as volumes:
+        for page_number, key in enumerate(order):
+            if key in stale:
+                volumes.add_overlay(next(rendered))
+            else:
+                volumes.add_overlay(existing[entries[key]["page"]])
+            new_entries[key] = {"hash": hashes.get(key, entries.get(key, {}).get("hash")), "page": page_number}
+
+    new_files = [os.path.basename(path) for path in volumes.paths]
+    for name in old_files:
+        if name not in new_files:
+            os.remove(os.path.join(output_dir, name))  # e.g. volume size changed
+    manifest[out_name] = {"files": new_files, "clients_per_volume": clients_per_volume, "clients": new_entries}
+    save_manifest(output_dir, manifest)
+
+    added = sum(1 for key in stale if key not in entries)
+    run_metrics.count("waivers rendered", len(stale))
+    run_metrics.count("waivers reused", len(order) - len(stale))
+    print(f"""
+Waiver Update Summary:
+  Reused:   {len(order) - len(stale)}
+  Replaced: {len(stale) - added}
+  Added:    {added}
+""")
+    return volumes.paths
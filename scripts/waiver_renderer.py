@@ -0,0 +1,239 @@
+# scripts/waiver_renderer.py
+#
+# Renders waiver pages from assets/waiver_template.pdf. Everything that is the
+# same for a whole batch -- the parsed template, the flattened page, the
+# signature image, the WSBA number and the year -- is prepared once when the
+# renderer is built; each client only costs a small name/case-number overlay.
+# Large batches can be spread over a process pool and streamed to disk
+# (render_waivers).
+
+import os
+import re
+import weakref
+from io import BytesIO
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from PyPDF2 import PageObject, PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+
+from scripts.text_layout import fit
+from scripts.waiver_stream import WaiverVolumes
+
+MAX_CASE_WIDTH = 220
+TEMPLATE_XOBJECT = "/Tpl"
+# Shrink the case-number font as the list grows: (font size, max lines at that size)
+CASE_FONT_LIMITS = ((10, 2), (9, 3), (8, 5), (7, 7), (6, None))
+
+# Top fields
+NAME_POS = (60, 648)
+CASES_POS = (350, 643)
+YEAR_POS = (356, 394)
+# Signature + bar fields
+SIGNATURE_BOX = (120, 230, 170, 45)
+BAR_POS = (105, 215)  # directly after "WSBA#"
+
+def _page_from_canvas(draw):
+    packet = BytesIO()
+    can = canvas.Canvas(packet, pagesize=letter)
+    draw(can)
+    can.save()
+    packet.seek(0)
+    return PdfReader(packet).pages[0]
+
+def create_overlay(name, case_num):
+    """Per-client layer: name and wrapped case numbers."""
+    def draw(can):
+        can.setFont("Helvetica", 10)
+        can.drawString(*NAME_POS, name)
+
+        font_size, lines = fit(case_num, MAX_CASE_WIDTH, CASE_FONT_LIMITS, separator=", ")
+        cases_x, cases_y = CASES_POS
+        can.setFont("Helvetica", font_size)
+        for i, line in enumerate(lines):
+            can.drawString(cases_x, cases_y - (i * (font_size + 2)), line)
+    return _page_from_canvas(draw)
+
+def create_static_layer(year, sig_path=None, bar_number="00000"):
+    """Per-batch layer: year, signature image and WSBA number."""
+    def draw(can):
+        can.setFont("Helvetica", 10)
+        can.drawString(*YEAR_POS, year)
+
+        if sig_path and os.path.exists(sig_path):
+            try:
+                print(f"[DEBUG] Adding signature from: {sig_path}")
+                from reportlab.lib.utils import ImageReader
+                img = ImageReader(sig_path)
+                x, y, width, height = SIGNATURE_BOX
+                can.drawImage(img, x, y, width=width, height=height, preserveAspectRatio=True, mask='auto')
+            except Exception as e:
+                print(f"[ERROR] Failed to add signature image: {e}")
+        else:
+            print(f"[WARNING] Signature image missing or invalid: {sig_path}")
+
+        can.setFont("Helvetica", 10)
+        can.drawString(*BAR_POS, bar_number)
+    return _page_from_canvas(draw)
+
+class WaiverRenderer:
+    """Renders waiver pages that share one copy of the template per output file.
+
+    The prepared template (flattened form, signature, WSBA number, year) is
+    stored once per writer as a form XObject. Every page is a tiny "draw the
+    template" stream plus that client's overlay, with shared resources, so a
+    batch costs one template plus a few hundred bytes per client.
+    """
+
+    def __init__(self, template_path, year, sig_path=None, bar_number="00000"):
+        reader = PdfReader(template_path)
+        page = reader.pages[0]
+
+        # Flatten the form fields (e.g. signature line)
+        if "/Annots" in page:
+            print("[DEBUG] Flattening AcroForm fields on template page...")
+            del page["/Annots"]
+        page.merge_page(create_static_layer(year, sig_path, bar_number))
+
+        self.template_data = page.get_contents().get_data()
+        self.template_resources = page["/Resources"].get_object()
+        self.mediabox = page.mediabox
+        self.fonts = self._fonts(page)
+        self.bar_number = bar_number
+        self._reader = reader
+        self._stamps = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _fonts(page):
+        fonts = page["/Resources"].get_object().get("/Font", DictionaryObject()).get_object()
+        return {name: fonts[name].get("/BaseFont") for name in fonts}
+
+    def _stamp(self, writer):
+        """(content, resources) references shared by every page in writer, added once."""
+        stamp = self._stamps.get(writer)
+        if stamp is None:
+            resources = self.template_resources.clone(writer)
+            xobject = DecodedStreamObject()
+            xobject.set_data(self.template_data)
+            xobject = xobject.flate_encode()
+            xobject.update({
+                NameObject("/Type"): NameObject("/XObject"),
+                NameObject("/Subtype"): NameObject("/Form"),
+                NameObject("/BBox"): ArrayObject(self.mediabox),
+                NameObject("/Resources"): resources,
+            })
+            page_resources = DictionaryObject({
+                NameObject("/Font"): resources.get("/Font", DictionaryObject()),
+                NameObject("/XObject"): DictionaryObject({NameObject(TEMPLATE_XOBJECT): writer._add_object(xobject)}),
+                NameObject("/ProcSet"): resources.get("/ProcSet", ArrayObject()),
+            })
+            content = DecodedStreamObject()
+            content.set_data(f"q {TEMPLATE_XOBJECT} Do Q\n".encode())
+            stamp = self._stamps[writer] = (writer._add_object(content), writer._add_object(page_resources))
+        return stamp
+
+    def add_content_page(self, writer, overlay_data):
+        """Append a page drawing the template plus a client's overlay content."""
+        stamp_content, resources = self._stamp(writer)
+        # Copy the bytes rather than clone the stream: overlay readers are
+        # short-lived, and a recycled id() would hit PdfWriter's clone cache.
+        content = DecodedStreamObject()
+        content.set_data(overlay_data)
+        page = PageObject.create_blank_page(writer, self.mediabox.width, self.mediabox.height)
+        page[NameObject("/Contents")] = ArrayObject([stamp_content, writer._add_object(content.flate_encode())])
+        page[NameObject("/Resources")] = resources
+        return writer.add_page(page)
+
+    def overlay_data(self, name, case_num):
+        """Content stream of one client's overlay, drawn with the template's fonts."""
+        overlay = create_overlay(name, case_num)
+        overlay_fonts = self._fonts(overlay)
+        if any(self.fonts.get(font) != base for font, base in overlay_fonts.items()):
+            raise ValueError(f"Waiver overlay uses fonts the template page doesn't define: {overlay_fonts}")
+        return overlay.get_contents().get_data()
+
+    def add_page(self, writer, name, case_num):
+        """Append one client's waiver to writer and return the new page."""
+        return self.add_content_page(writer, self.overlay_data(name, case_num))
+
+    @staticmethod
+    def extract_overlay(page):
+        """The client overlay of a page made by add_content_page or WaiverStream, else None."""
+        contents = page.get("/Contents")
+        xobjects = page["/Resources"].get_object().get("/XObject", DictionaryObject()).get_object()
+        if isinstance(contents, ArrayObject) and len(contents) == 2 and TEMPLATE_XOBJECT in xobjects:
+            return contents[1].get_object().get_data()
+        return None
+
+# === Batch rendering ===
+# Big batches are split into fixed-size chunks rendered by worker processes,
+# each with its own WaiverRenderer, which send back only the client overlays.
+# Chunks are consumed in submission order, so pages keep client order whatever
+# finishes first, and only a few chunks are in flight at a time.
+# Worker start-up (a fresh interpreter per process on Windows) costs more than
+# rendering a few hundred pages at ~3 ms each; per-client files are ~20 ms each.
+PARALLEL_MIN_CLIENTS = 200
+PARALLEL_MIN_CLIENTS_WITH_FILES = 30
+CHUNK_SIZE = 50
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+_worker_renderer = None
+
+def _init_worker(template_path, year, sig_path, bar_number):
+    global _worker_renderer
+    _worker_renderer = WaiverRenderer(template_path, year, sig_path=sig_path, bar_number=bar_number)
+
+def client_pdf_name(name):
+    return re.sub(r'[<>:"/\\|?*]', '', name).strip() or "Unknown"
+
+def _render_overlays(clients, client_dir, renderer):
+    overlays = []
+    for name, case_num in clients:
+        overlay_data = renderer.overlay_data(name, case_num)
+        if client_dir:
+            single = PdfWriter()
+            renderer.add_content_page(single, overlay_data)
+            with open(os.path.join(client_dir, f"{client_pdf_name(name)}.pdf"), "wb") as f:
+                single.write(f)
+        overlays.append(overlay_data)
+    return overlays
+
+def _render_chunk(clients, client_dir=None):
+    return _render_overlays(clients, client_dir, _worker_renderer)
+
+def iter_overlays(clients, template_path, year, sig_path=None, bar_number="00000",
+                  workers=None, client_dir=None, renderer=None):
+    """Yield each client's overlay content in order, from a process pool for big batches."""
+    workers = workers or os.cpu_count() or 1
+    if client_dir:
+        os.makedirs(client_dir, exist_ok=True)
+    min_clients = PARALLEL_MIN_CLIENTS_WITH_FILES if client_dir else PARALLEL_MIN_CLIENTS
+
+    if workers <= 1 or len(clients) < min_clients:
+        renderer = renderer or WaiverRenderer(template_path, year, sig_path=sig_path, bar_number=bar_number)
+        for start in range(0, len(clients), CHUNK_SIZE):
+            yield from _render_overlays(clients[start:start + CHUNK_SIZE], client_dir, renderer)
+        return
+
+    print(f"[INFO] Rendering {len(clients)} waivers across {workers} processes...")
+    chunks = (clients[start:start + CHUNK_SIZE] for start in range(0, len(clients), CHUNK_SIZE))
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(template_path, year, sig_path, bar_number)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_render_chunk, chunk, client_dir))
+            if len(pending) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def render_waivers(clients, template_path, year, out_path, sig_path=None, bar_number="00000",
+                   workers=None, client_dir=None, clients_per_volume=None):
+    """Stream [(name, case_numbers)] into out_path (or its numbered parts); returns the paths written."""
+    renderer = WaiverRenderer(template_path, year, sig_path=sig_path, bar_number=bar_number)
+    with WaiverVolumes(out_path, renderer, clients_per_volume) as volumes:
+        for overlay_data in iter_overlays(clients, template_path, year, sig_path, bar_number,
+                                          workers, client_dir, renderer):
+            volumes.add_overlay(overlay_data)
+    return volumes.paths
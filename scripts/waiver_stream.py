@@ -0,0 +1,238 @@
+# scripts/waiver_stream.py
+#
+# Streaming output for waiver batches. PdfWriter keeps every page in memory
+# until write(); WaiverStream instead writes the shared template objects once
+# (see WaiverRenderer._stamp) and then each page straight to disk as it is
+# rendered, so peak memory stays flat however many clients there are. Only
+# the page tree, xref table and trailer are written at the end.
+#
+# WaiverVolumes splits a batch into "{date} {bar} part N.pdf" files of at
+# most N clients each.
+#
+# The shared objects are laid out by a scratch PdfWriter, which means reading
+# its private state; SharedObjects is the only code that does. It is used only
+# with PyPDF2 versions it was checked against (STREAMING_PYPDF2_VERSIONS); with
+# any other version waivers fall back to BufferedWaiverFile, a plain
+# PdfWriter.write() that holds the volume in memory but is always correct.
+
+import os
+import PyPDF2
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, IndirectObject, NameObject
+
+STREAMING_PYPDF2_VERSIONS = ("3.0.",)
+
+class SharedObjects:
+    """Objects every streamed page shares, numbered by a scratch PdfWriter.
+
+    Adapter over PdfWriter internals (_objects, _pages, _root, _info and the
+    renderer's _stamp, which uses _add_object). Raises NotImplementedError if
+    they don't look as expected.
+    """
+
+    def __init__(self, renderer):
+        if not PyPDF2.__version__.startswith(STREAMING_PYPDF2_VERSIONS):
+            raise NotImplementedError(f"streaming not checked against PyPDF2 {PyPDF2.__version__}")
+        try:
+            scratch = PdfWriter()
+            stamp_content, resources = renderer._stamp(scratch)
+            self.stamp_content = IndirectObject(stamp_content.idnum, 0, None)
+            self.resources = IndirectObject(resources.idnum, 0, None)
+            self.pages_id = scratch._pages.idnum
+            self.root_id = scratch._root.idnum
+            self.info_id = scratch._info.idnum
+            # The page tree is written by WaiverStream.close()
+            self.objects = [(idnum, obj) for idnum, obj in enumerate(scratch._objects, start=1)
+                            if idnum != self.pages_id]
+            self.next_id = len(scratch._objects) + 1
+        except (AttributeError, TypeError) as e:
+            raise NotImplementedError(f"unexpected PyPDF2 {PyPDF2.__version__} writer layout: {e}") from e
+
+class WaiverStream:
+    def __init__(self, path, renderer, shared=None):
+        shared = shared or SharedObjects(renderer)
+        self.path = path
+        self.renderer = renderer
+        self.tmp_path = f"{path}.tmp"
+        self.file = open(self.tmp_path, "wb")
+        # Only ints are kept per page, so memory stays flat as the file grows
+        self.offsets = {}
+        self.page_ids = []
+
+        self.stamp_content = shared.stamp_content
+        self.resources = shared.resources
+        self.pages_id = shared.pages_id
+        self.root_id = shared.root_id
+        self.info_id = shared.info_id
+
+        self.file.write(b"%PDF-1.3\n%\xe2\xe3\xcf\xd3\n")
+        for idnum, obj in shared.objects:
+            self._write_object(idnum, obj)
+        self.next_id = shared.next_id
+
+    def _write_object(self, idnum, obj):
+        self.offsets[idnum] = self.file.tell()
+        self.file.write(f"{idnum} 0 obj\n".encode())
+        obj.write_to_stream(self.file, None)
+        self.file.write(b"\nendobj\n")
+
+    def _new_id(self):
+        idnum = self.next_id
+        self.next_id += 1
+        return idnum
+
+    def add_overlay(self, overlay_data):
+        """Write one page: the shared template plus this client's overlay content."""
+        content = DecodedStreamObject()
+        content.set_data(overlay_data)
+        content_id = self._new_id()
+        self._write_object(content_id, content.flate_encode())
+
+        mediabox = self.renderer.mediabox
+        page = DictionaryObject({
+            NameObject("/Type"): NameObject("/Page"),
+            NameObject("/Parent"): IndirectObject(self.pages_id, 0, None),
+            NameObject("/MediaBox"): ArrayObject(mediabox),
+            NameObject("/Resources"): self.resources,
+            NameObject("/Contents"): ArrayObject([self.stamp_content, IndirectObject(content_id, 0, None)]),
+        })
+        page_id = self._new_id()
+        self._write_object(page_id, page)
+        self.page_ids.append(page_id)
+
+    def add_page(self, name, case_num):
+        self.add_overlay(self.renderer.overlay_data(name, case_num))
+
+    @property
+    def page_count(self):
+        return len(self.page_ids)
+
+    def close(self):
+        if self.file is None:
+            return
+        self.offsets[self.pages_id] = self.file.tell()
+        self.file.write(f"{self.pages_id} 0 obj\n<< /Type /Pages /Count {len(self.page_ids)} /Kids [".encode())
+        for page_id in self.page_ids:
+            self.file.write(f" {page_id} 0 R".encode())
+        self.file.write(b" ] >>\nendobj\n")
+
+        xref_offset = self.file.tell()
+        self.file.write(f"xref\n0 {self.next_id}\n0000000000 65535 f \n".encode())
+        for idnum in range(1, self.next_id):
+            self.file.write(f"{self.offsets[idnum]:010d} 00000 n \n".encode())
+        self.file.write(
+            f"trailer\n<< /Size {self.next_id} /Root {self.root_id} 0 R /Info {self.info_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n".encode()
+        )
+        self.file.close()
+        self.file = None
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class BufferedWaiverFile:
+    """Same interface as WaiverStream, built on PdfWriter.write(); the whole file is held in memory."""
+
+    def __init__(self, path, renderer):
+        self.path = path
+        self.renderer = renderer
+        self.writer = PdfWriter()
+        self.page_count = 0
+
+    def add_overlay(self, overlay_data):
+        self.renderer.add_content_page(self.writer, overlay_data)
+        self.page_count += 1
+
+    def add_page(self, name, case_num):
+        self.add_overlay(self.renderer.overlay_data(name, case_num))
+
+    def close(self):
+        if self.writer is None:
+            return
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            self.writer.write(f)
+        os.replace(tmp_path, self.path)
+        self.writer = None
+
+    def abort(self):
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+_fallback_reported = False
+
+def open_waiver_file(path, renderer):
+    """A WaiverStream, or a BufferedWaiverFile if this PyPDF2 can't be streamed safely."""
+    global _fallback_reported
+    try:
+        shared = SharedObjects(renderer)
+    except NotImplementedError as e:
+        if not _fallback_reported:
+            print(f"[WARNING] Writing waivers without streaming ({e}).")
+            _fallback_reported = True
+        return BufferedWaiverFile(path, renderer)
+    return WaiverStream(path, renderer, shared)
+
+def volume_path(out_path, part):
+    stem, ext = os.path.splitext(out_path)
+    return f"{stem} part {part}{ext}"
+
+class WaiverVolumes:
+    """Streams pages into out_path, or into numbered parts of at most clients_per_volume pages."""
+
+    def __init__(self, out_path, renderer, clients_per_volume=None):
+        self.out_path = out_path
+        self.renderer = renderer
+        self.clients_per_volume = clients_per_volume or None
+        self.paths = []
+        self.page_count = 0
+        self.current = None
+
+    def add_overlay(self, overlay_data):
+        if self.current is None or (self.clients_per_volume and self.current.page_count >= self.clients_per_volume):
+            self._roll()
+        self.current.add_overlay(overlay_data)
+        self.page_count += 1
+
+    def _roll(self):
+        if self.current is not None:
+            self.current.close()
+        path = volume_path(self.out_path, len(self.paths) + 1) if self.clients_per_volume else self.out_path
+        self.current = open_waiver_file(path, self.renderer)
+        self.paths.append(path)
+
+    def close(self):
+        if self.current is None:
+            self._roll()  # an empty batch still produces its (empty) file
+        self.current.close()
+        return self.paths
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self.current is not None:
+            self.current.abort()
@@ -0,0 +1,97 @@
+# tests/test_lni_http.py
+#
+# LNI detail pages over HTTP (LNI.fetch_detail_html / save_detail_to_html_http)
+# against a local http.server stub serving canned Detail.aspx pages: a full
+# page is returned as-is, a page that is only the wrapper is left to the
+# browser, and requests still wait for the host's token bucket.
+# Run from the repo root:
+#   python -m pytest tests
+
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAVORITE_BUTTON_DIR = os.path.join(REPO_DIR, "scripts", "FavoriteButton")
+for path in (REPO_DIR, FAVORITE_BUTTON_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import LNI
+from navigation import configure_rate
+from benchmarks.fixtures import make_lni_detail_page
+
+# Served for ?LicenseNumber=wrapper: the page shell without the contractor data
+WRAPPER_PAGE = """<!DOCTYPE html>
+<html><head><title>Verify a Contractor</title></head>
+<body><div id="layoutContainer"><div class="hdrText"></div><span id="BusinessName"></span></div></body></html>"""
+
+@pytest.fixture
+def stub():
+    """Base URL of a stub Detail.aspx server; records the time of every request."""
+    requests_seen = []
+
+    class DetailHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append(time.monotonic())
+            key = self.path.rsplit("=", 1)[-1]
+            page = WRAPPER_PAGE if key == "wrapper" else make_lni_detail_page(seed=int(key))
+            body = page.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DetailHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    configure_rate(host, 1000, 1000)  # unthrottled unless a test says otherwise
+    try:
+        yield f"http://{host}:{port}/verify/Detail.aspx?LicenseNumber=", host, requests_seen
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_fetch_returns_pages_in_order(stub):
+    base, _, _ = stub
+    urls = [f"{base}{i}" for i in range(6)]
+    pages = LNI.fetch_detail_html(urls, workers=4)
+    assert pages == [make_lni_detail_page(seed=i) for i in range(6)]
+
+def test_wrapper_only_page_falls_back_to_the_browser(stub, tmp_path, monkeypatch):
+    base, _, _ = stub
+    urls = [f"{base}0", f"{base}wrapper", f"{base}1"]
+    assert LNI.fetch_detail_html(urls) == [make_lni_detail_page(seed=0), None, make_lni_detail_page(seed=1)]
+
+    browser_loads = []
+    def browser_detail_html(driver, url, nav, idx):
+        browser_loads.append(url)
+        return make_lni_detail_page(seed=99)
+    monkeypatch.setattr(LNI, "browser_detail_html", browser_detail_html)
+    monkeypatch.setattr(LNI, "TEMP_HTML_DIR", str(tmp_path))
+
+    with LNI.lni_session() as session:
+        paths = LNI.save_detail_to_html_http(None, urls, nav=object(), session=session)
+    assert browser_loads == [f"{base}wrapper"]
+    assert len(paths) == 3
+    with open(paths[1], encoding="utf-8") as f:
+        assert f.read() == make_lni_detail_page(seed=99)
+
+def test_fetch_waits_for_the_host_token_bucket(stub):
+    base, host, requests_seen = stub
+    rate, n_pages = 10.0, 6
+    configure_rate(host, rate, 1)
+    LNI.fetch_detail_html([f"{base}{i}" for i in range(n_pages)], workers=n_pages)
+    assert len(requests_seen) == n_pages
+    # One token up front, then one every 1/rate seconds however many workers there are
+    spread = max(requests_seen) - min(requests_seen)
+    assert spread >= (n_pages - 1) / rate * 0.9
@@ -0,0 +1,31 @@
+# tests/test_startup.py
+#
+# Startup guard: importing the GUI or a feature entry point must not load the
+# heavy dependencies, which are imported inside the functions that use them.
+# benchmarks/bench_startup.py reports the timings; this only checks what loads.
+# Run from the repo root:
+#   python -m pytest tests
+
+import os
+import re
+import sys
+import subprocess
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFERRED = ("selenium", "bs4", "PyPDF2", "pypdf", "reportlab", "lxml", "requests")
+ENTRY_POINTS = ["main", "scripts.scrape_cases", "scripts.batch_scrape", "scripts.calendar_crawl", "scripts.create_waivers"]
+IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+\d+ \| *(\S+)")
+
+def imported_modules(module, tmp_path):
+    env = dict(os.environ, LOCALAPPDATA=str(tmp_path))  # keep away from the real config
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=REPO_DIR, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return {match.group(1) for match in map(IMPORT_LINE.match, result.stderr.splitlines()) if match}
+
+@pytest.mark.parametrize("module", ENTRY_POINTS)
+def test_heavy_dependencies_are_deferred(module, tmp_path):
+    loaded = {name.split(".")[0] for name in imported_modules(module, tmp_path)}
+    assert not loaded & set(DEFERRED), f"import {module} loads {sorted(loaded & set(DEFERRED))}"